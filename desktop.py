@@ -10,15 +10,30 @@ from tkinter import ttk, messagebox, simpledialog
 from enum import Enum
 import time
 import os
+import sys
+import queue
+import hashlib
+import itertools
 import random
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
 try:
-    from PIL import Image, ImageDraw
+    from PIL import Image, ImageDraw, ImageFilter, ImageTk
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
 
+from simulator import fast_boot_enabled
+
+WALLPAPER_CACHE_SIZE = 4       # rendered wallpapers kept, one per (width, height)
+WALLPAPER_DEBOUNCE_MS = 120    # quiet time after the last <Configure> before rendering
+WALLPAPER_POLL_MS = 15
+ICON_ATLAS_SIZE = 64           # rasterized icons kept, one per (icon_name, color, size)
+ICON_DESIGN_SIZE = 50          # draw_icon coordinates are laid out on a 50x50 grid
+ICON_SUPERSAMPLE = 4
+
 class ProcessState(Enum):
     READY = "READY"
     RUNNING = "RUNNING"
@@ -37,7 +52,10 @@ class Process:
         self.creation_time: float = time.time()
 
 class OSDesktop:
-    def __init__(self, root) -> None:
+    def __init__(self, root, fast_boot: bool = False) -> None:
+        self.started: float = time.perf_counter()
+        self.fast_boot: bool = fast_boot
+        self.startup_ms: float | None = None
         self.root: Any = root
         self.root.title("Operating System OS - Desktop")
         
@@ -90,7 +108,14 @@ class OSDesktop:
         self.wallpaper_pil = None
         self.wallpaper_render = None
         self.wallpaper_source: str = ""
+        self.wallpaper_cache: OrderedDict[tuple[int, int], tk.PhotoImage] = OrderedDict()
+        self.wallpaper_size: tuple[int, int] = (0, 0)
+        self._wallpaper_after = None
+        self._wallpaper_worker: threading.Thread | None = None
+        self._wallpaper_results: queue.SimpleQueue = queue.SimpleQueue()
+        self._wallpaper_decoded: queue.SimpleQueue = queue.SimpleQueue()
         self.app_icon_cache = {}
+        self.icon_atlas: OrderedDict[tuple[str, str, int], tk.PhotoImage] = OrderedDict()
         self.task_manager_views = []  # Changed back to list
         self.cursor_styles = {}
         self.open_windows = {}  # Track open application windows
@@ -132,7 +157,15 @@ class OSDesktop:
         self.start_update_thread()
         
                         
-        self.show_boot_screen()
+        if not self.fast_boot:
+            self.show_boot_screen()
+        self.root.after_idle(self._report_startup)
+    
+    def _report_startup(self) -> None:
+        """Record time from construction to the first idle main loop pass"""
+        self.startup_ms = (time.perf_counter() - self.started) * 1000
+        if self.fast_boot:
+            print(f"Desktop ready in {self.startup_ms:.1f} ms")
     
     def setup_ui(self) -> None:
         try:
@@ -200,58 +233,119 @@ class OSDesktop:
         self.time_label.pack(side=tk.RIGHT, padx=(0, 10))
     
     def draw_wallpaper(self, event) -> None:
-        """Paint the desktop wallpaper."""
-        self.wallpaper_canvas.delete("wallpaper")
+        """Show the cached render for this size, or render once resizing settles"""
+        if event.width <= 1 or event.height <= 1:
+            return
+        self.wallpaper_size = (event.width, event.height)
+        if self._wallpaper_after is not None:
+            self.root.after_cancel(self._wallpaper_after)
+            self._wallpaper_after = None
+        cached = self.wallpaper_cache.get(self.wallpaper_size)
+        if cached is not None:
+            self.wallpaper_cache.move_to_end(self.wallpaper_size)
+            self._show_wallpaper(cached)
+            return
+        # The first paint goes out at once; later sizes wait for the drag to stop
+        delay: int = WALLPAPER_DEBOUNCE_MS if self.wallpaper_canvas.find_withtag("wallpaper") else 0
+        self._wallpaper_after = self.root.after(delay, self._render_wallpaper)
 
+    def _render_wallpaper(self) -> None:
+        """Resample on a worker thread, or paint the Pillow-free wallpaper directly"""
+        self._wallpaper_after = None
+        width, height = self.wallpaper_size
+        if not (self.wallpaper_pil and PIL_AVAILABLE):
+            self._paint_fallback_wallpaper(width, height)
+            return
+        if self._wallpaper_worker is not None and self._wallpaper_worker.is_alive():
+            return  # _poll_wallpaper renders the latest size when this one lands
+        self._wallpaper_worker = threading.Thread(
+            target=self._resample_wallpaper,
+            args=(self.wallpaper_pil, width, height),
+            name="wallpaper",
+            daemon=True,
+        )
+        self._wallpaper_worker.start()
+        self.root.after(WALLPAPER_POLL_MS, self._poll_wallpaper)
 
-        if self.wallpaper_pil and PIL_AVAILABLE and event.width > 0 and event.height > 0:
-            img_w, img_h = self.wallpaper_pil.size
-            scale = max(event.width / img_w, event.height / img_h)
+    def _resample_wallpaper(self, source, width, height) -> None:
+        """Worker thread: scale to cover, center-crop and sharpen (no Tk calls here)"""
+        try:
+            img_w, img_h = source.size
+            scale: float = max(width / img_w, height / img_h)
             new_size: tuple[int, int] = (max(1, int(img_w * scale)), max(1, int(img_h * scale)))
-            if PIL_AVAILABLE:
-                try:
-                    from PIL import Image, ImageTk                
-                    # Use high-quality resampling for better image quality
-                    resized = self.wallpaper_pil.resize(new_size, Image.LANCZOS if hasattr(Image, 'LANCZOS') else Image.BICUBIC)
-                                                
-                    left = max(0, (resized.width - event.width) // 2)
-                    top = max(0, (resized.height - event.height) // 2)
-                    cropped = resized.crop((left, top, left + event.width, top + event.height))
-                    
-                    # Apply slight sharpening to improve clarity
-                    if hasattr(ImageFilter, 'SHARPEN'):
-                        from PIL import ImageFilter
-                        cropped = cropped.filter(ImageFilter.SHARPEN)
-                    
-                    self.wallpaper_render = ImageTk.PhotoImage(cropped)
-                    self.wallpaper_canvas.create_image(0, 0, image=self.wallpaper_render, anchor="nw", tags="wallpaper")
-                    return
-                except Exception:
-                    pass
+            resized = source.resize(new_size, Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.BICUBIC)
+            left: int = max(0, (resized.width - width) // 2)
+            top: int = max(0, (resized.height - height) // 2)
+            image = resized.crop((left, top, left + width, top + height)).filter(ImageFilter.SHARPEN)
+        except Exception:
+            image = None
+        self._wallpaper_results.put(((width, height), image))
+
+    def _poll_wallpaper(self) -> None:
+        """Hand a finished render to Tk, caching it as an LRU entry"""
+        try:
+            size, image = self._wallpaper_results.get_nowait()
+        except queue.Empty:
+            self.root.after(WALLPAPER_POLL_MS, self._poll_wallpaper)
+            return
+        if image is None:
+            self._paint_fallback_wallpaper(*self.wallpaper_size)
+            return
+        photo = ImageTk.PhotoImage(image)
+        self._cache_wallpaper(size, photo)
+        if size == self.wallpaper_size:
+            self._show_wallpaper(photo)
+        elif self.wallpaper_size in self.wallpaper_cache:
+            self._show_wallpaper(self.wallpaper_cache[self.wallpaper_size])
+        elif self._wallpaper_after is None:
+            self._render_wallpaper()
+
+    def _cache_wallpaper(self, size, photo) -> None:
+        self.wallpaper_cache[size] = photo
+        while len(self.wallpaper_cache) > WALLPAPER_CACHE_SIZE:
+            self.wallpaper_cache.popitem(last=False)
 
+    def _show_wallpaper(self, photo) -> None:
+        self.wallpaper_render = photo
+        self.wallpaper_canvas.delete("wallpaper")
+        self.wallpaper_canvas.create_image(0, 0, image=photo, anchor="nw", tags="wallpaper")
+        self.wallpaper_canvas.tag_lower("wallpaper")
+
+    def _paint_fallback_wallpaper(self, width, height) -> None:
+        """Center the Tk-loaded image, or draw a gradient when there is none"""
+        self.wallpaper_canvas.delete("wallpaper")
         if self.wallpaper_photo:
             self.wallpaper_canvas.create_image(
-                event.width // 2,
-                event.height // 2,
+                width // 2,
+                height // 2,
                 image=self.wallpaper_photo,
                 anchor="center",
                 tags="wallpaper",
             )
             return
 
+        photo = self._gradient_wallpaper(width, height)
+        self._cache_wallpaper((width, height), photo)
+        self._show_wallpaper(photo)
+
+    def _gradient_wallpaper(self, width, height) -> tk.PhotoImage:
+        """Build the gradient as one image: a 1-pixel column zoomed across the width"""
         top: tuple[int, ...] = self._hex_to_rgb(self.colors["wallpaper_glow"])
         mid: tuple[int, ...] = self._hex_to_rgb(self.colors["wallpaper_mid"])
         bottom: tuple[int, ...] = self._hex_to_rgb(self.colors["wallpaper_dark"])
-        steps: int = max(event.height, 1)
+        steps: int = max(height, 1)
 
+        rows: list[str] = []
         for i in range(steps):
             ratio = i / steps
             if ratio < 0.35:
                 blend = self._blend(top, mid, ratio / 0.35)
             else:
                 blend = self._blend(mid, bottom, (ratio - 0.35) / 0.65)
-            color = f"#{blend[0]:02x}{blend[1]:02x}{blend[2]:02x}"
-            self.wallpaper_canvas.create_line(0, i, event.width, i, fill=color, tags="wallpaper")
+            rows.append(f"{{#{blend[0]:02x}{blend[1]:02x}{blend[2]:02x}}}")
+        column = tk.PhotoImage(width=1, height=steps)
+        column.put(" ".join(rows))
+        return column.zoom(max(width, 1), 1)
     
     def _hex_to_rgb(self, value) -> tuple[int, ...]:
         value = value.lstrip("#")
@@ -402,6 +496,7 @@ class OSDesktop:
                 self.window_z_order.remove(app_name)
     
     def _load_wallpaper_image(self) -> None:
+        """Find the wallpaper; with Pillow it is decoded on a worker thread"""
         candidates: list[str] = [
             "wallpaper_tree.png",
             "wallpaper_tree.jpg",
@@ -419,64 +514,156 @@ class OSDesktop:
         self.wallpaper_pil = None
         self.wallpaper_photo = None
         self.wallpaper_source: str = ""
-        pil_image = None
-        if PIL_AVAILABLE:
-            pil_image = Image
-        for folder in search_dirs:
-            for name in candidates:
-                path = os.path.join(folder, name)
-                if not os.path.exists(path):
-                    continue
-                if pil_image is not None:
-                    try:
-                        self.wallpaper_pil = pil_image.open(path).convert("RGB")
-                        self.wallpaper_source = path
-                        return
-                    except Exception:
-                        self.wallpaper_pil = None
-                if os.path.splitext(name)[1].lower() not in {".png", ".gif", ".ppm", ".pgm"}:
-                    continue
-                try:
-                    self.wallpaper_photo = tk.PhotoImage(file=path)
-                    self.wallpaper_source = path
-                    return
-                except Exception:
-                    self.wallpaper_photo = None
-        fallback_path: str = os.path.join(base_dir, "assets", "wallpaper", "wallpaper_fallback.ppm")
+        self.wallpaper_paths: list[str] = [
+            os.path.join(folder, name)
+            for folder in search_dirs
+            for name in candidates
+            if os.path.exists(os.path.join(folder, name))
+        ]
+        if PIL_AVAILABLE and self.wallpaper_paths:
+            # Until the decode lands, draw_wallpaper paints the gradient placeholder
+            threading.Thread(
+                target=self._decode_wallpaper,
+                args=(self.wallpaper_paths, self.root.winfo_screenwidth(), self.root.winfo_screenheight()),
+                name="wallpaper-decode",
+                daemon=True,
+            ).start()
+            self.root.after(WALLPAPER_POLL_MS, self._poll_wallpaper_source)
+            return
+        self._load_wallpaper_photo(self.wallpaper_paths, base_dir)
+
+    def _load_wallpaper_photo(self, paths, base_dir) -> None:
+        """Pillow-free path: let Tk read the image, or generate a PPM it can read"""
+        for path in paths:
+            if os.path.splitext(path)[1].lower() not in {".png", ".gif", ".ppm", ".pgm"}:
+                continue
+            try:
+                self.wallpaper_photo = tk.PhotoImage(file=path)
+                self.wallpaper_source = path
+                return
+            except Exception:
+                self.wallpaper_photo = None
+        width: int = self.root.winfo_screenwidth()
+        height: int = self.root.winfo_screenheight()
+        fallback_path: str = self._fallback_wallpaper_path(base_dir, width, height)
         os.makedirs(os.path.dirname(fallback_path), exist_ok=True)
         if not os.path.exists(fallback_path):
-            self._generate_fallback_wallpaper(fallback_path)
+            self._generate_fallback_wallpaper(fallback_path, width, height)
         try:
             self.wallpaper_photo = tk.PhotoImage(file=fallback_path)
             self.wallpaper_source = fallback_path
         except Exception:
             self.wallpaper_photo = None
 
-    def _generate_fallback_wallpaper(self, path) -> None:
-        """Generate a static PPM wallpaper that Tk can load without Pillow."""
-        width, height = 1920, 1200
+    def _decode_wallpaper(self, paths, width, height) -> None:
+        """Worker thread: decode the first readable candidate (no Tk calls here)"""
+        for path in paths:
+            try:
+                image = self._open_prescaled(path, width, height)
+            except Exception:
+                continue
+            self._wallpaper_decoded.put((path, image))
+            return
+        self._wallpaper_decoded.put((None, None))
+
+    def _open_prescaled(self, path, width, height):
+        """Decode near screen size, reusing a derivative saved beside the source
 
+        The derivative's mtime is set to the source's, so replacing the
+        source invalidates it.
+        """
+        mtime: int = os.stat(path).st_mtime_ns
+        stem: str = os.path.splitext(path)[0]
+        derivative: str = f"{stem}.{width}x{height}.cache.ppm"
+        try:
+            if os.stat(derivative).st_mtime_ns == mtime:
+                with Image.open(derivative) as cached:
+                    return cached.convert("RGB")
+        except OSError:
+            pass
+
+        with Image.open(path) as source:
+            native: tuple[int, int] = source.size
+            source.draft("RGB", (width, height))  # JPEG: decode at 1/2, 1/4 or 1/8 scale
+            image = source.convert("RGB")
+        factor: int = min(image.width // width, image.height // height)
+        if factor >= 2:
+            image = image.reduce(factor)
+        scale: float = max(width / image.width, height / image.height)
+        if scale < 1:
+            size: tuple[int, int] = (max(width, round(image.width * scale)), max(height, round(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.BICUBIC)
+        if image.size != native:
+            try:
+                partial: str = derivative + ".tmp"
+                image.save(partial, format="PPM")
+                os.utime(partial, ns=(mtime, mtime))
+                os.replace(partial, derivative)
+            except OSError:
+                pass
+        return image
+
+    def _poll_wallpaper_source(self) -> None:
+        """Swap the decoded wallpaper in for the placeholder"""
+        try:
+            path, image = self._wallpaper_decoded.get_nowait()
+        except queue.Empty:
+            self.root.after(WALLPAPER_POLL_MS, self._poll_wallpaper_source)
+            return
+        if image is None:
+            self._load_wallpaper_photo(self.wallpaper_paths, os.path.dirname(os.path.abspath(__file__)))
+        else:
+            self.wallpaper_pil = image
+            self.wallpaper_source = path
+        self.wallpaper_cache.clear()
+        if self.wallpaper_size != (0, 0):
+            if self._wallpaper_after is not None:
+                self.root.after_cancel(self._wallpaper_after)
+            self._render_wallpaper()
+
+    def _fallback_wallpaper_path(self, base_dir, width, height) -> str:
+        """Cache file named by a hash of the gradient colors and the size"""
+        key: str = "|".join(self.colors[name] for name in ("wallpaper_light", "wallpaper_mid", "wallpaper_dark"))
+        digest: str = hashlib.sha1(f"{key}|{width}x{height}".encode("ascii")).hexdigest()[:12]
+        return os.path.join(base_dir, "assets", "wallpaper", f"wallpaper_fallback_{digest}.ppm")
+
+    def _generate_fallback_wallpaper(self, path, width=1920, height=1200) -> None:
+        """Generate a static PPM wallpaper that Tk can load without Pillow."""
         top: tuple[int, ...] = self._hex_to_rgb(self.colors["wallpaper_light"])
         mid: tuple[int, ...] = self._hex_to_rgb(self.colors["wallpaper_mid"])
         bottom: tuple[int, ...] = self._hex_to_rgb(self.colors["wallpaper_dark"])
+        bases: list[tuple[int, ...]] = []
+        for y in range(height):
+            ratio = y / max(1, height - 1)
+            if ratio < 0.45:
+                bases.append(self._blend(top, mid, ratio / 0.45))
+            else:
+                bases.append(self._blend(mid, bottom, (ratio - 0.45) / 0.55))
+        # Horizontal glow: brightest at the center column, added on top of each row's base
+        glows: list[int] = [int(30 * (1 - abs(0.5 - x / max(1, width - 1)) * 2)) for x in range(width)]
+
+        # The glow only has ~30 distinct values in long runs, so a row is a few
+        # dozen repeated pixels; rows that share a base color are built once
+        runs = [(g, len(list(group))) for g, group in itertools.groupby(glows)]
+        rows: dict[tuple[int, ...], bytes] = {}
+        for base in bases:
+            if base not in rows:
+                rows[base] = b"".join(
+                    bytes((
+                        max(0, min(255, base[0] + g // 3)),
+                        max(0, min(255, base[1] + g // 2)),
+                        max(0, min(255, base[2] + g)),
+                    )) * count
+                    for g, count in runs
+                )
+        data: bytes = b"".join(rows[base] for base in bases)
+
         try:
-            with open(path, "wb") as f:
+            partial: str = path + ".tmp"
+            with open(partial, "wb") as f:
                 f.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
-                for y in range(height):
-                    ratio = y / max(1, height - 1)
-                    if ratio < 0.45:
-                        base = self._blend(top, mid, ratio / 0.45)
-                    else:
-                        base = self._blend(mid, bottom, (ratio - 0.45) / 0.55)
-                    row = bytearray()
-                    for x in range(width):
-                        xr = x / max(1, width - 1)
-                        glow = int(30 * (1 - abs(0.5 - xr) * 2))
-                        r: int = max(0, min(255, base[0] + glow // 3))
-                        g: int = max(0, min(255, base[1] + glow // 2))
-                        b: int = max(0, min(255, base[2] + glow))
-                        row.extend((r, g, b))
-                    f.write(row)
+                f.write(data)
+            os.replace(partial, path)
         except Exception:
             pass
 
@@ -559,55 +746,150 @@ class OSDesktop:
         self.app_icon_cache[cache_key] = None
         return None
     
-    def draw_icon(self, canvas, icon_name, color) -> None:
-        """Draw a simple vector-style icon on a Tk canvas"""
-        canvas.delete("all")
+    def _icon_shapes(self, icon_name, color) -> list[tuple[str, tuple, dict]]:
+        """Vector icon as (canvas item type, coords, options) on the 50x50 grid"""
         bg = "#0f172a"
         stroke = "#111827"
-        self._draw_rounded_rect(canvas, 3, 3, 47, 47, radius=10, outline=stroke, fill=bg, width=1)
-        
         if icon_name == "folder":
-            canvas.create_rectangle(8, 16, 42, 40, outline="", fill=color)
-            canvas.create_rectangle(8, 12, 28, 22, outline="", fill=color)
-        elif icon_name == "terminal":
-            canvas.create_rectangle(8, 12, 42, 38, outline=stroke, fill="#0b1224", width=1)
-            canvas.create_line(12, 20, 20, 24, fill=color, width=2)
-            canvas.create_line(20, 24, 12, 28, fill=color, width=2)
-            canvas.create_line(24, 30, 36, 30, fill=color, width=2)
-        elif icon_name == "monitor":
-            canvas.create_rectangle(8, 10, 44, 32, outline=stroke, fill="#0b1224", width=1)
-            canvas.create_rectangle(20, 32, 32, 38, outline="", fill=stroke)
-            canvas.create_line(14, 26, 20, 20, 28, 22, 36, 14, smooth=True, fill=color, width=2)
-        elif icon_name == "tasks":
-            canvas.create_rectangle(9, 10, 41, 38, outline=stroke, fill="#0b1224", width=1)
-            canvas.create_rectangle(13, 28, 17, 34, outline="", fill=color)
-            canvas.create_rectangle(21, 22, 25, 34, outline="", fill=color)
-            canvas.create_rectangle(29, 16, 33, 34, outline="", fill=color)
-        elif icon_name == "mail":
-            canvas.create_rectangle(8, 12, 42, 36, outline=stroke, fill=color, width=1)
-            canvas.create_line(8, 12, 25, 26, 42, 12, fill=bg, width=2)
-            canvas.create_line(8, 36, 24, 24, 42, 36, fill=bg, width=2)
-        elif icon_name == "media":
-            canvas.create_oval(10, 10, 42, 42, outline="", fill=color)
-            canvas.create_polygon(22, 16, 36, 26, 22, 36, outline="", fill=bg)
-        elif icon_name == "calendar":
-            canvas.create_rectangle(10, 14, 40, 40, outline=stroke, fill=color, width=1)
-            canvas.create_rectangle(10, 10, 40, 20, outline="", fill="#0b1224")
-            canvas.create_text(25, 30, text="18", fill=bg, font=("Segoe UI", 10, "bold"))
-        elif icon_name == "settings":
-            canvas.create_oval(12, 12, 38, 38, outline=stroke, fill="#0b1224", width=2)
-            canvas.create_oval(18, 18, 32, 32, outline="", fill=color)
+            return [
+                ("rectangle", (8, 16, 42, 40), {"outline": "", "fill": color}),
+                ("rectangle", (8, 12, 28, 22), {"outline": "", "fill": color}),
+            ]
+        if icon_name == "terminal":
+            return [
+                ("rectangle", (8, 12, 42, 38), {"outline": stroke, "fill": "#0b1224", "width": 1}),
+                ("line", (12, 20, 20, 24), {"fill": color, "width": 2}),
+                ("line", (20, 24, 12, 28), {"fill": color, "width": 2}),
+                ("line", (24, 30, 36, 30), {"fill": color, "width": 2}),
+            ]
+        if icon_name == "monitor":
+            return [
+                ("rectangle", (8, 10, 44, 32), {"outline": stroke, "fill": "#0b1224", "width": 1}),
+                ("rectangle", (20, 32, 32, 38), {"outline": "", "fill": stroke}),
+                ("line", (14, 26, 20, 20, 28, 22, 36, 14), {"smooth": True, "fill": color, "width": 2}),
+            ]
+        if icon_name == "tasks":
+            return [
+                ("rectangle", (9, 10, 41, 38), {"outline": stroke, "fill": "#0b1224", "width": 1}),
+                ("rectangle", (13, 28, 17, 34), {"outline": "", "fill": color}),
+                ("rectangle", (21, 22, 25, 34), {"outline": "", "fill": color}),
+                ("rectangle", (29, 16, 33, 34), {"outline": "", "fill": color}),
+            ]
+        if icon_name == "mail":
+            return [
+                ("rectangle", (8, 12, 42, 36), {"outline": stroke, "fill": color, "width": 1}),
+                ("line", (8, 12, 25, 26, 42, 12), {"fill": bg, "width": 2}),
+                ("line", (8, 36, 24, 24, 42, 36), {"fill": bg, "width": 2}),
+            ]
+        if icon_name == "media":
+            return [
+                ("oval", (10, 10, 42, 42), {"outline": "", "fill": color}),
+                ("polygon", (22, 16, 36, 26, 22, 36), {"outline": "", "fill": bg}),
+            ]
+        if icon_name == "calendar":
+            return [
+                ("rectangle", (10, 14, 40, 40), {"outline": stroke, "fill": color, "width": 1}),
+                ("rectangle", (10, 10, 40, 20), {"outline": "", "fill": "#0b1224"}),
+                ("text", (25, 30), {"text": "18", "fill": bg, "font": ("Segoe UI", 10, "bold")}),
+            ]
+        if icon_name == "settings":
+            shapes = [
+                ("oval", (12, 12, 38, 38), {"outline": stroke, "fill": "#0b1224", "width": 2}),
+                ("oval", (18, 18, 32, 32), {"outline": "", "fill": color}),
+            ]
             for dx, dy in [(0, -10), (0, 10), (-10, 0), (10, 0)]:
-                canvas.create_rectangle(24 + dx - 2, 24 + dy - 6, 24 + dx + 2, 24 + dy + 6, outline="", fill=stroke)
-        elif icon_name == "photos":
-            canvas.create_rectangle(8, 12, 42, 40, outline=stroke, fill="#0b1224", width=1)
-            canvas.create_polygon(10, 38, 20, 26, 28, 34, 34, 24, 40, 36, outline="", fill=color)
-            canvas.create_oval(12, 16, 20, 24, outline="", fill=self.colors["accent_yellow"])
-        elif icon_name == "about":
-            canvas.create_oval(10, 10, 42, 42, outline=stroke, fill=color, width=1)
-            canvas.create_text(26, 26, text="i", fill=bg, font=("Segoe UI", 12, "bold"))
+                shapes.append(("rectangle", (24 + dx - 2, 24 + dy - 6, 24 + dx + 2, 24 + dy + 6), {"outline": "", "fill": stroke}))
+            return shapes
+        if icon_name == "photos":
+            return [
+                ("rectangle", (8, 12, 42, 40), {"outline": stroke, "fill": "#0b1224", "width": 1}),
+                ("polygon", (10, 38, 20, 26, 28, 34, 34, 24, 40, 36), {"outline": "", "fill": color}),
+                ("oval", (12, 16, 20, 24), {"outline": "", "fill": self.colors["accent_yellow"]}),
+            ]
+        if icon_name == "about":
+            return [
+                ("oval", (10, 10, 42, 42), {"outline": stroke, "fill": color, "width": 1}),
+                ("text", (26, 26), {"text": "i", "fill": bg, "font": ("Segoe UI", 12, "bold")}),
+            ]
+        return [("oval", (12, 12, 38, 38), {"outline": "", "fill": color})]
+
+    def draw_icon(self, canvas, icon_name, color) -> None:
+        """Draw a vector-style icon scaled to the canvas, from the icon atlas when Pillow is available"""
+        canvas.delete("all")
+        size: int = int(canvas.cget("width"))
+        scale: float = size / ICON_DESIGN_SIZE
+        shapes = self._icon_shapes(icon_name, color)
+        photo = self._icon_image(icon_name, color, size, shapes)
+        if photo is not None:
+            canvas.image = photo  # keeps the icon alive after atlas eviction
+            canvas.create_image(0, 0, image=photo, anchor="nw")
+            shapes = [shape for shape in shapes if shape[0] == "text"]
         else:
-            canvas.create_oval(12, 12, 38, 38, outline="", fill=color)
+            self._draw_rounded_rect(canvas, 3 * scale, 3 * scale, 47 * scale, 47 * scale, radius=10 * scale, outline="#111827", fill="#0f172a", width=1)
+        for kind, coords, options in shapes:
+            if kind == "text":
+                family, points, weight = options["font"]
+                options = dict(options, font=(family, max(6, round(points * scale)), weight))
+            getattr(canvas, f"create_{kind}")(*(c * scale for c in coords), **options)
+
+    def _icon_image(self, icon_name, color, size, shapes):
+        """Rasterize an icon once per (icon_name, color, size); None without Pillow"""
+        if not PIL_AVAILABLE:
+            return None
+        key: tuple[str, str, int] = (icon_name, color, size)
+        photo = self.icon_atlas.get(key)
+        if photo is not None:
+            self.icon_atlas.move_to_end(key)
+            return photo
+        try:
+            photo = ImageTk.PhotoImage(self._rasterize_icon(shapes, size))
+        except Exception:
+            return None
+        self.icon_atlas[key] = photo
+        while len(self.icon_atlas) > ICON_ATLAS_SIZE:
+            self.icon_atlas.popitem(last=False)
+        return photo
+
+    def _rasterize_icon(self, shapes, size):
+        """Paint the non-text shapes with Pillow, supersampled for smooth edges"""
+        k: float = size * ICON_SUPERSAMPLE / ICON_DESIGN_SIZE
+        image = Image.new("RGBA", (size * ICON_SUPERSAMPLE, size * ICON_SUPERSAMPLE), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        draw.rounded_rectangle((3 * k, 3 * k, 47 * k, 47 * k), radius=10 * k, fill="#0f172a", outline="#111827", width=max(1, round(k)))
+        for kind, coords, options in shapes:
+            if kind == "text":
+                continue
+            points: list[float] = [c * k for c in coords]
+            fill = options.get("fill") or None
+            outline = options.get("outline") or None
+            width: int = max(1, round(options.get("width", 1) * k))
+            if kind == "rectangle":
+                draw.rectangle(points, fill=fill, outline=outline, width=width)
+            elif kind == "oval":
+                draw.ellipse(points, fill=fill, outline=outline, width=width)
+            elif kind == "polygon":
+                draw.polygon(points, fill=fill, outline=outline)
+            elif kind == "line":
+                if options.get("smooth"):
+                    points = self._smooth_line(points)
+                draw.line(points, fill=fill, width=width, joint="curve")
+        return image.resize((size, size), Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.BICUBIC)
+
+    def _smooth_line(self, points, steps=12) -> list[float]:
+        """Flatten a Tk smooth=True line: quadratic splines through the segment midpoints"""
+        pts: list[tuple[float, float]] = list(zip(points[::2], points[1::2]))
+        if len(pts) < 3:
+            return points
+        out: list[float] = list(pts[0])
+        for i in range(1, len(pts) - 1):
+            start = pts[0] if i == 1 else ((pts[i - 1][0] + pts[i][0]) / 2, (pts[i - 1][1] + pts[i][1]) / 2)
+            end = pts[-1] if i == len(pts) - 2 else ((pts[i][0] + pts[i + 1][0]) / 2, (pts[i][1] + pts[i + 1][1]) / 2)
+            ctrl = pts[i]
+            for step in range(1, steps + 1):
+                t: float = step / steps
+                for axis in (0, 1):
+                    out.append((1 - t) ** 2 * start[axis] + 2 * (1 - t) * t * ctrl[axis] + t * t * end[axis])
+        return out
     
     def build_desktop_icons(self) -> None:
         """Lay out desktop icons in a simple grid"""
@@ -1815,7 +2097,8 @@ class OSDesktop:
 
 def main() -> None:
     root = tk.Tk()
-    app: OSDesktop = OSDesktop(root)
+    fast_boot: bool = "--fast-boot" in sys.argv[1:] or fast_boot_enabled()
+    app: OSDesktop = OSDesktop(root, fast_boot=fast_boot)
     root.mainloop()
 
 if __name__ == "__main__":
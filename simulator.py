@@ -4,11 +4,73 @@ Operating System OS Simulator
 Demonstrates the kernel, process management, memory, and shell
 """
 
+import codecs
+import contextlib
+import csv
+import heapq
+import importlib
+import importlib.util
+import io
+import itertools
+import json
+import mmap
 import os
+import random
+import re
+import shutil
+import struct
 import sys
 import time
+import zlib
+from array import array
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+
+# numpy is only needed by BatchSimulator and costs more to import than the
+# rest of the simulator, so it is loaded on first use.
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+FAST_BOOT_ENV = "OS_FAST_BOOT"
+
+def load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+def fast_boot_enabled():
+    """True when OS_FAST_BOOT is set to anything but empty/0/false/no"""
+    return os.environ.get(FAST_BOOT_ENV, "").lower() not in ("", "0", "false", "no")
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "os.config")
+
+def load_config(path=CONFIG_PATH):
+    """Parse KEY = VALUE lines from os.config, converting numbers to int"""
+    config = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if "=" not in line:
+                    continue
+                key, value = (part.strip() for part in line.split("=", 1))
+                try:
+                    config[key] = int(value, 0)
+                except ValueError:
+                    config[key] = value
+    except OSError:
+        pass
+    return config
 
 class ProcessState(Enum):
     READY = "READY"
@@ -16,78 +78,2226 @@ class ProcessState(Enum):
     WAITING = "WAITING"
     BLOCKED = "BLOCKED"
     TERMINATED = "TERMINATED"
+    
+    __hash__ = object.__hash__
+
+STATE_LABELS = {state: f"{state.value:<8}" for state in ProcessState}
 
 class Process:
     def __init__(self, pid, name, priority=0):
         self.pid = pid
         self.name = name
-        self.state = ProcessState.READY
+        self._table = None
+        self._state = ProcessState.READY
         self.priority = priority
         self.memory_kb = 0
+        self.memory_regions = []
         self.creation_time = time.time()
+        self.vruntime = 0.0
+        self.run_ticks = 0
+        self.wait_ticks = 0
+        self.dispatches = 0
+        self.max_latency = 0
+        self.ready_since = 0
+        self.bursts = None
+        self.burst_remaining = 0
+        self.row_prefix = f"{pid}\t{name:<15}\t"
+    
+    @property
+    def state(self):
+        return self._state
+    
+    @state.setter
+    def state(self, new_state):
+        if self._table is not None and new_state is not self._state:
+            self._table.move(self, self._state, new_state)
+        self._state = new_state
+    
+    def __repr__(self):
+        return f"{self.row_prefix}{STATE_LABELS[self._state]}\t{self.priority}"
+
+class ProcessTable:
+    """PID-indexed process table with one ordered set per state"""
+    
+    def __init__(self, on_ready=None):
+        self.by_pid = {}
+        self.by_state = {state: {} for state in ProcessState}
+        self.on_ready = on_ready
+    
+    def add(self, process):
+        self.by_pid[process.pid] = process
+        self.by_state[process.state][process.pid] = process
+        process._table = self
+        if self.on_ready and process.state is ProcessState.READY:
+            self.on_ready(process)
+    
+    def remove(self, pid):
+        process = self.by_pid.pop(pid, None)
+        if process is not None:
+            del self.by_state[process.state][pid]
+            process._table = None
+        return process
+    
+    def move(self, process, old_state, new_state):
+        del self.by_state[old_state][process.pid]
+        self.by_state[new_state][process.pid] = process
+        if self.on_ready and new_state is ProcessState.READY:
+            self.on_ready(process)
+    
+    def get(self, pid):
+        return self.by_pid.get(pid)
+    
+    def in_state(self, state):
+        return self.by_state[state].values()
+    
+    def count(self, state):
+        return len(self.by_state[state])
+    
+    def live(self):
+        """Non-terminated processes in PID order, built without visiting zombies"""
+        terminated = ProcessState.TERMINATED
+        live = [p for state, members in self.by_state.items() if state is not terminated
+                for p in members.values()]
+        live.sort(key=lambda p: p.pid)
+        return live
+    
+    def __len__(self):
+        return len(self.by_pid)
+    
+    def __iter__(self):
+        return iter(self.by_pid.values())
+    
+    def __contains__(self, pid):
+        return pid in self.by_pid
+    
+    def __bool__(self):
+        return bool(self.by_pid)
+
+def quantum_ticks_from_config(config):
+    """CONTEXT_SWITCH_MS expressed in TIMER_FREQUENCY_HZ ticks"""
+    hz = config.get("TIMER_FREQUENCY_HZ", 100)
+    return max(1, config.get("CONTEXT_SWITCH_MS", 10) * hz // 1000)
+
+class RoundRobinScheduler:
+    """FIFO run queue; the preempted process rejoins at the tail"""
+    
+    name = "rr"
+    
+    def __init__(self, quantum_ticks=1):
+        self.quantum_ticks = max(1, quantum_ticks)
+        self.run_queue = deque()
+        self.queued = set()
+    
+    @classmethod
+    def from_config(cls, config):
+        return cls(quantum_ticks_from_config(config))
+    
+    def enqueue(self, process, now=0):
+        if process.pid not in self.queued:
+            self.queued.add(process.pid)
+            self.run_queue.append(process)
+    
+    def pick_next(self, now=0):
+        while self.run_queue:
+            process = self.run_queue.popleft()
+            self.queued.discard(process.pid)
+            if process.state is ProcessState.READY:
+                return process
+        return None
+    
+    def tick(self, now, current, slice_ticks):
+        """Return True when the running process should be preempted"""
+        return slice_ticks >= self.quantum_ticks
+    
+    def __len__(self):
+        return len(self.run_queue)
+
+class PriorityScheduler:
+    """One FIFO per priority level; the highest set bitmap bit runs first
+    
+    Higher numbers are more important. A process keeps the CPU past its
+    quantum unless another waits at its level or above, so equal levels
+    round-robin and lower ones never steal a slice. Every aging_ticks the
+    head of each level is raised to its base priority plus aging_step per
+    aging_ticks it has been waiting, and a process drops back to its base
+    priority once it is picked.
+    """
+    
+    name = "priority"
+    
+    def __init__(self, quantum_ticks=1, levels=256, aging_ticks=100, aging_step=16):
+        self.quantum_ticks = max(1, quantum_ticks)
+        self.levels = levels
+        self.aging_ticks = aging_ticks
+        self.aging_step = aging_step
+        self.queues = [deque() for _ in range(levels)]
+        self.bitmap = 0
+        self.queued = {}
+        self.promotions = 0
+        self.next_aging = aging_ticks
+    
+    @classmethod
+    def from_config(cls, config):
+        return cls(quantum_ticks_from_config(config),
+                   levels=config.get("PRIORITY_LEVELS", 256),
+                   aging_step=config.get("PRIORITY_AGING_STEP", 16))
+    
+    def _push(self, process, level, since):
+        self.queued[process.pid] = level
+        self.queues[level].append((since, process))
+        self.bitmap |= 1 << level
+    
+    def level_of(self, process):
+        return min(max(process.priority, 0), self.levels - 1)
+    
+    def enqueue(self, process, now=0):
+        if process.pid not in self.queued:
+            self._push(process, self.level_of(process), now)
+    
+    def top_level(self):
+        return self.bitmap.bit_length() - 1
+    
+    def pick_next(self, now=0):
+        while self.bitmap:
+            level = self.bitmap.bit_length() - 1
+            queue = self.queues[level]
+            _, process = queue.popleft()
+            if not queue:
+                self.bitmap &= ~(1 << level)
+            del self.queued[process.pid]
+            if process.state is ProcessState.READY:
+                return process
+        return None
+    
+    def age(self, now):
+        """Raise the oldest waiter of each level in proportion to its wait
+        
+        The enqueue tick is kept across promotions, so a process that has
+        waited k * aging_ticks sits aging_step * k levels above its base.
+        Only queue heads move, so a pass costs at most one operation per
+        occupied level regardless of how many processes are waiting.
+        """
+        top = self.levels - 1
+        bits = self.bitmap & ~(1 << top)
+        while bits:
+            level = bits.bit_length() - 1
+            bits &= ~(1 << level)
+            queue = self.queues[level]
+            since, process = queue[0]
+            target = min(top, self.level_of(process) + self.aging_step * ((now - since) // self.aging_ticks))
+            if target > level:
+                queue.popleft()
+                self._push(process, target, since)
+                self.promotions += 1
+                if not queue:
+                    self.bitmap &= ~(1 << level)
+    
+    def tick(self, now, current, slice_ticks):
+        if self.aging_ticks and now >= self.next_aging:
+            self.age(now)
+            self.next_aging = now + self.aging_ticks
+        # Past the quantum only a peer or better may take over; otherwise
+        # the process starts a fresh quantum (multiples of quantum_ticks)
+        if slice_ticks % self.quantum_ticks == 0:
+            return self.top_level() >= self.level_of(current)
+        return self.top_level() > self.level_of(current)
+    
+    def __len__(self):
+        return len(self.queued)
+
+def priority_weight(priority):
+    """Map priority 0..255 onto the CFS nice-to-weight curve (nice 19..-20)"""
+    nice = 19 - min(max(priority, 0), 255) * 39 // 255
+    return 1024 / (1.25 ** nice)
+
+class FairScheduler:
+    """CFS-style policy: the READY process with the smallest vruntime runs
+    
+    vruntime grows by 1024/weight per tick of CPU, so higher priorities
+    age slower. The ready set is a min-heap, making pick_next O(log N).
+    min_vruntime follows the smaller of the running and leftmost queued
+    vruntimes (never moving backwards), and newcomers start there.
+    """
+    
+    name = "cfs"
+    
+    def __init__(self, quantum_ticks=1):
+        self.quantum_ticks = max(1, quantum_ticks)
+        self.heap = []
+        self.queued = set()
+        self.min_vruntime = 0.0
+        self.seq = 0
+        self.running = None
+    
+    @classmethod
+    def from_config(cls, config):
+        return cls(quantum_ticks_from_config(config))
+    
+    def _update_min_vruntime(self, running):
+        heap = self.heap
+        while heap and heap[0][2].state is not ProcessState.READY:
+            self.queued.discard(heapq.heappop(heap)[2].pid)
+        lowest = heap[0][0] if heap else None
+        if running is not None and (lowest is None or running.vruntime < lowest):
+            lowest = running.vruntime
+        if lowest is not None and lowest > self.min_vruntime:
+            self.min_vruntime = lowest
+    
+    def enqueue(self, process, now=0):
+        if process.pid in self.queued:
+            return
+        running = self.running
+        self._update_min_vruntime(running if running is not process else None)
+        if process.vruntime < self.min_vruntime:
+            process.vruntime = self.min_vruntime
+        self.queued.add(process.pid)
+        self.seq += 1
+        heapq.heappush(self.heap, (process.vruntime, self.seq, process))
+    
+    def pick_next(self, now=0):
+        while self.heap:
+            vruntime, _, process = heapq.heappop(self.heap)
+            self.queued.discard(process.pid)
+            if process.state is ProcessState.READY:
+                if vruntime > self.min_vruntime:
+                    self.min_vruntime = vruntime
+                self.running = process
+                return process
+        self.running = None
+        return None
+    
+    def tick(self, now, current, slice_ticks):
+        current.vruntime += 1024 / priority_weight(current.priority)
+        self.running = current
+        self._update_min_vruntime(current)
+        if slice_ticks < self.quantum_ticks:
+            return False
+        heap = self.heap
+        return bool(heap) and heap[0][0] < current.vruntime
+    
+    def __len__(self):
+        return len(self.queued)
+
+SCHEDULERS = {
+    RoundRobinScheduler.name: RoundRobinScheduler,
+    PriorityScheduler.name: PriorityScheduler,
+    FairScheduler.name: FairScheduler,
+}
+
+PAGE_SIZE = 4096
+KERNEL_RESERVED_PAGES = 256
+DEFAULT_PROCESS_KB = 64
+FREE_RUN = re.compile(b"\x00+")
+
+def histogram_percentiles(histogram, quantiles):
+    """Smallest key reaching each quantile of a {value: count} histogram"""
+    samples = sum(histogram.values())
+    results = [0] * len(quantiles)
+    if not samples:
+        return results
+    pending = sorted(range(len(quantiles)), key=lambda i: quantiles[i])
+    seen = 0
+    for key in sorted(histogram):
+        seen += histogram[key]
+        while pending and seen >= quantiles[pending[0]] * samples:
+            results[pending.pop(0)] = key
+    return results
+
+class PageAllocator:
+    """Physical page allocator mirroring memory_allocate() in kernel/memory.c
+    
+    First-fit over pages [256, total_pages), returning byte addresses and
+    0 on failure like the C code. Pages are tracked one byte each so free
+    runs are found with bytearray.find, which scans in C a machine word at
+    a time, starting from a cached hint below which no page is free.
+    bitmap() packs the map into the kernel's memory_bitmap layout.
+    
+    Subclasses change the placement policy by overriding _allocate() and
+    _free(); allocate() times each call into a power-of-two nanosecond
+    latency histogram.
+    """
+    
+    name = "first-fit"
+    
+    def __init__(self, total_pages=65536, reserved_pages=KERNEL_RESERVED_PAGES):
+        self.total_pages = total_pages
+        self.reserved_pages = reserved_pages
+        self.pages = bytearray(total_pages)
+        self.pages[:reserved_pages] = b"\x01" * reserved_pages
+        self.used_pages = reserved_pages
+        self.free_hint = reserved_pages
+        self.allocations = 0
+        self.failed_allocations = 0
+        self.latency_histogram = Counter()
+    
+    def allocate(self, size):
+        pages_needed = max(1, (size + PAGE_SIZE - 1) // PAGE_SIZE)
+        started = time.perf_counter_ns()
+        start = self._allocate(pages_needed)
+        self.latency_histogram[(time.perf_counter_ns() - started).bit_length()] += 1
+        if start < 0:
+            self.failed_allocations += 1
+            return 0
+        self.allocations += 1
+        return start * PAGE_SIZE
+    
+    def free(self, address, size):
+        page = address // PAGE_SIZE
+        if self.reserved_pages <= page < self.total_pages:
+            self._free(page, max(1, (size + PAGE_SIZE - 1) // PAGE_SIZE))
+    
+    def _mark(self, start, pages_needed):
+        self.pages[start:start + pages_needed] = b"\x01" * pages_needed
+        self.used_pages += pages_needed
+        if start == self.free_hint:
+            hint = self.pages.find(0, start + pages_needed)
+            self.free_hint = self.total_pages if hint < 0 else hint
+    
+    def _allocate(self, pages_needed):
+        start = self.pages.find(bytes(pages_needed), self.free_hint)
+        if start >= 0:
+            self._mark(start, pages_needed)
+        return start
+    
+    def _free(self, page, pages):
+        end = min(page + pages, self.total_pages)
+        self.used_pages -= self.pages.count(1, page, end)
+        self.pages[page:end] = bytes(end - page)
+        if page < self.free_hint:
+            self.free_hint = page
+    
+    @property
+    def free_pages(self):
+        return self.total_pages - self.used_pages
+    
+    def free_runs(self):
+        """(start_page, length) of every free run"""
+        return [(m.start(), m.end() - m.start()) for m in FREE_RUN.finditer(self.pages, self.reserved_pages)]
+    
+    def largest_free_block(self):
+        return max((length for _, length in self.free_runs()), default=0)
+    
+    def fragmentation(self):
+        """External fragmentation: 1 - largest free block / total free pages"""
+        if not self.free_pages:
+            return 0.0
+        return 1 - self.largest_free_block() / self.free_pages
+    
+    def stats(self):
+        p50, p99 = histogram_percentiles(self.latency_histogram, (0.50, 0.99))
+        return {
+            "allocator": self.name,
+            "allocations": self.allocations,
+            "alloc_failures": self.failed_allocations,
+            "free_pages": self.free_pages,
+            "largest_free_block": self.largest_free_block(),
+            "fragmentation": self.fragmentation(),
+            "internal_fragmentation": 0.0,  # exact page counts; BuddyAllocator rounds up
+            "alloc_p50_ns": 1 << p50 if p50 else 0,
+            "alloc_p99_ns": 1 << p99 if p99 else 0,
+        }
+    
+    def bitmap(self):
+        """Pack into the kernel's byte array, bit (page % 8) of byte page / 8"""
+        packed = bytearray(self.total_pages // 8)
+        for index in range(len(packed)):
+            chunk = self.pages[index * 8:index * 8 + 8]
+            packed[index] = sum(1 << bit for bit, used in enumerate(chunk) if used)
+        return bytes(packed)
+
+class NextFitAllocator(PageAllocator):
+    """First-fit that resumes searching where the last allocation ended"""
+    
+    name = "next-fit"
+    
+    def __init__(self, total_pages=65536, reserved_pages=KERNEL_RESERVED_PAGES):
+        super().__init__(total_pages, reserved_pages)
+        self.rover = reserved_pages
+    
+    def _allocate(self, pages_needed):
+        run = bytes(pages_needed)
+        start = self.pages.find(run, self.rover)
+        if start < 0:
+            start = self.pages.find(run, self.free_hint, self.rover + pages_needed - 1)
+        if start >= 0:
+            self._mark(start, pages_needed)
+            self.rover = start + pages_needed
+        return start
+
+class BuddyAllocator(PageAllocator):
+    """Binary buddy system: power-of-two blocks split on demand, merged on free
+    
+    free_lists[order] holds the start pages of free 2**order-page blocks
+    and nonempty has bit order set while that list is non-empty, so the
+    smallest usable order is found with one mask and bit_length().
+    """
+    
+    name = "buddy"
+    
+    def __init__(self, total_pages=65536, reserved_pages=KERNEL_RESERVED_PAGES):
+        super().__init__(total_pages, reserved_pages)
+        self.max_order = total_pages.bit_length() - 1
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.nonempty = 0
+        self.block_order = {}
+        self.requested_pages = 0
+        page = reserved_pages
+        while page < total_pages:
+            order = min((page & -page).bit_length() - 1 if page else self.max_order,
+                        (total_pages - page).bit_length() - 1)
+            self._push(page, order)
+            page += 1 << order
+        self.max_block = self.largest_free_block()
+    
+    def _push(self, page, order):
+        self.free_lists[order].add(page)
+        self.nonempty |= 1 << order
+    
+    def _pop(self, order):
+        free_list = self.free_lists[order]
+        page = free_list.pop()
+        if not free_list:
+            self.nonempty &= ~(1 << order)
+        return page
+    
+    def _allocate(self, pages_needed):
+        order = (pages_needed - 1).bit_length()
+        candidates = self.nonempty >> order
+        if not candidates:
+            return -1
+        found = order + (candidates & -candidates).bit_length() - 1
+        page = self._pop(found)
+        while found > order:
+            found -= 1
+            self._push(page + (1 << found), found)
+        self.block_order[page] = order
+        self.used_pages += 1 << order
+        self.requested_pages += pages_needed
+        return page
+    
+    def _free(self, page, pages):
+        order = self.block_order.pop(page, None)
+        if order is None:
+            return
+        self.used_pages -= 1 << order
+        self.requested_pages -= pages
+        while order < self.max_order:
+            buddy = page ^ (1 << order)
+            free_list = self.free_lists[order]
+            if buddy not in free_list:
+                break
+            free_list.remove(buddy)
+            if not free_list:
+                self.nonempty &= ~(1 << order)
+            page = min(page, buddy)
+            order += 1
+        self._push(page, order)
+    
+    def free_runs(self):
+        return sorted((page, 1 << order) for order, pages in enumerate(self.free_lists) for page in pages)
+    
+    def largest_free_block(self):
+        return 1 << (self.nonempty.bit_length() - 1) if self.nonempty else 0
+    
+    def fragmentation(self):
+        """Measured against the biggest block the free pages could merge into"""
+        if not self.free_pages:
+            return 0.0
+        return 1 - self.largest_free_block() / min(self.free_pages, self.max_block)
+    
+    def stats(self):
+        stats = super().stats()
+        allocated = self.used_pages - self.reserved_pages
+        stats["internal_fragmentation"] = 1 - self.requested_pages / allocated if allocated else 0.0
+        return stats
+    
+    def bitmap(self):
+        for page, order in self.block_order.items():
+            self.pages[page:page + (1 << order)] = b"\x01" * (1 << order)
+        packed = super().bitmap()
+        self.pages[self.reserved_pages:] = bytes(self.total_pages - self.reserved_pages)
+        return packed
+
+ALLOCATORS = {
+    PageAllocator.name: PageAllocator,
+    NextFitAllocator.name: NextFitAllocator,
+    BuddyAllocator.name: BuddyAllocator,
+}
+
+KERNEL_SPACE_START = 0xC0000000
+PAGE_SHIFT = 12
+PT_ENTRIES = 1024
+EMPTY_PAGE_TABLE = array("i", [-1]) * PT_ENTRIES
+
+class PageTable:
+    """Two-level x86-style page table: 1024 directory slots of array('i') tables
+    
+    Second-level tables are allocated on first mapping, so a sparse
+    address space costs 4 KB per touched 4 MB region.
+    """
+    
+    __slots__ = ("directory", "mapped")
+    
+    def __init__(self):
+        self.directory = [None] * PT_ENTRIES
+        self.mapped = 0
+    
+    def lookup(self, vpn):
+        table = self.directory[vpn >> 10]
+        return -1 if table is None else table[vpn & 1023]
+    
+    def map(self, vpn, frame):
+        table = self.directory[vpn >> 10]
+        if table is None:
+            table = self.directory[vpn >> 10] = array("i", EMPTY_PAGE_TABLE)
+        table[vpn & 1023] = frame
+        self.mapped += 1
+    
+    def unmap(self, vpn):
+        table = self.directory[vpn >> 10]
+        frame = table[vpn & 1023]
+        table[vpn & 1023] = -1
+        self.mapped -= 1
+        return frame
+    
+    def entries(self):
+        """(vpn, frame) for every mapped page"""
+        for index, table in enumerate(self.directory):
+            if table is not None:
+                for offset, frame in enumerate(table):
+                    if frame >= 0:
+                        yield (index << 10) | offset, frame
+
+class FIFOReplacement:
+    name = "fifo"
+    
+    def __init__(self, frames):
+        self.frames = frames
+        self.queue = OrderedDict()
+    
+    def hit(self, key):
+        pass
+    
+    def insert(self, key):
+        """Make key resident; return the evicted key, if any"""
+        self.queue[key] = None
+        if len(self.queue) > self.frames:
+            return self.queue.popitem(last=False)[0]
+        return None
+    
+    def remove(self, key):
+        self.queue.pop(key, None)
+
+class LRUReplacement(FIFOReplacement):
+    name = "lru"
+    
+    def hit(self, key):
+        self.queue.move_to_end(key)
+
+class ClockReplacement:
+    """Second-chance ring: one referenced bit per frame, hand clears as it sweeps"""
+    
+    name = "clock"
+    
+    def __init__(self, frames):
+        self.frames = frames
+        self.keys = [None] * frames
+        self.referenced = bytearray(frames)
+        self.slot = {}
+        self.free_slots = list(range(frames - 1, -1, -1))
+        self.hand = 0
+    
+    def hit(self, key):
+        self.referenced[self.slot[key]] = 1
+    
+    def insert(self, key):
+        victim = None
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            referenced = self.referenced
+            while referenced[self.hand]:
+                referenced[self.hand] = 0
+                self.hand = (self.hand + 1) % self.frames
+            slot = self.hand
+            self.hand = (self.hand + 1) % self.frames
+            victim = self.keys[slot]
+            del self.slot[victim]
+        self.keys[slot] = key
+        self.referenced[slot] = 1
+        self.slot[key] = slot
+        return victim
+    
+    def remove(self, key):
+        slot = self.slot.pop(key, None)
+        if slot is not None:
+            self.keys[slot] = None
+            self.referenced[slot] = 0
+            self.free_slots.append(slot)
+
+class ARCReplacement:
+    """Adaptive Replacement Cache (Megiddo & Modha)
+    
+    t1/t2 hold resident pages seen once/more than once; b1/b2 remember
+    recently evicted keys and steer the target size p of t1.
+    """
+    
+    name = "arc"
+    
+    def __init__(self, frames):
+        self.frames = frames
+        self.p = 0
+        self.t1, self.t2 = OrderedDict(), OrderedDict()
+        self.b1, self.b2 = OrderedDict(), OrderedDict()
+    
+    def hit(self, key):
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+    
+    def _replace(self, in_b2):
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            victim = self.t1.popitem(last=False)[0]
+            self.b1[victim] = None
+        else:
+            victim = self.t2.popitem(last=False)[0]
+            self.b2[victim] = None
+        return victim
+    
+    def insert(self, key):
+        c = self.frames
+        t1, t2, b1, b2 = self.t1, self.t2, self.b1, self.b2
+        victim = None
+        if key in b1:
+            self.p = min(c, self.p + max(len(b2) // len(b1), 1))
+            del b1[key]
+            if len(t1) + len(t2) >= c:
+                victim = self._replace(False)
+            t2[key] = None
+            return victim
+        if key in b2:
+            self.p = max(0, self.p - max(len(b1) // len(b2), 1))
+            del b2[key]
+            if len(t1) + len(t2) >= c:
+                victim = self._replace(True)
+            t2[key] = None
+            return victim
+        if len(t1) + len(b1) >= c:
+            if len(t1) < c:
+                b1.popitem(last=False)
+                if len(t1) + len(t2) >= c:
+                    victim = self._replace(False)
+            else:
+                victim = t1.popitem(last=False)[0]
+        elif len(t1) + len(t2) >= c:
+            if len(t1) + len(t2) + len(b1) + len(b2) >= 2 * c:
+                b2.popitem(last=False)
+            victim = self._replace(False)
+        t1[key] = None
+        return victim
+    
+    def remove(self, key):
+        for queue in (self.t1, self.t2, self.b1, self.b2):
+            queue.pop(key, None)
+
+REPLACEMENT_POLICIES = {
+    FIFOReplacement.name: FIFOReplacement,
+    LRUReplacement.name: LRUReplacement,
+    ClockReplacement.name: ClockReplacement,
+    ARCReplacement.name: ARCReplacement,
+}
+
+class VirtualMemory:
+    """Demand paging over a fixed pool of user frames, with a TLB
+    
+    Each PID gets a PageTable for the user half of the address space;
+    addresses at or above KERNEL_SPACE_START are the shared kernel
+    mapping and never fault. Pages are keyed (pid << 20) | vpn for the
+    TLB and the replacement policy, so the TLB is tagged by address
+    space and survives context switches.
+    """
+    
+    def __init__(self, frames=1024, policy="lru", tlb_entries=64):
+        self.frames = frames
+        self.policy = REPLACEMENT_POLICIES[policy](frames)
+        self.tlb_entries = tlb_entries
+        self.tlb = {}
+        self.page_tables = {}
+        self.free_frames = list(range(frames - 1, -1, -1))
+        self.references = 0
+        self.kernel_references = 0
+        self.tlb_hits = 0
+        self.page_faults = 0
+        self.evictions = 0
+    
+    def page_table(self, pid):
+        table = self.page_tables.get(pid)
+        if table is None:
+            table = self.page_tables[pid] = PageTable()
+        return table
+    
+    def access(self, pid, vaddr):
+        """Translate one reference; returns the physical frame"""
+        if vaddr >= KERNEL_SPACE_START:
+            self.kernel_references += 1
+            return (vaddr - KERNEL_SPACE_START) >> PAGE_SHIFT
+        self.references += 1
+        vpn = vaddr >> PAGE_SHIFT
+        key = (pid << 20) | vpn
+        tlb = self.tlb
+        frame = tlb.pop(key, -1)
+        if frame >= 0:
+            self.tlb_hits += 1
+            self.policy.hit(key)
+        else:
+            table = self.page_table(pid)
+            frame = table.lookup(vpn)
+            if frame >= 0:
+                self.policy.hit(key)
+            else:
+                frame = self._fault(table, key, vpn)
+            if len(tlb) >= self.tlb_entries:
+                del tlb[next(iter(tlb))]
+        tlb[key] = frame
+        return frame
+    
+    def _fault(self, table, key, vpn):
+        self.page_faults += 1
+        victim = self.policy.insert(key)
+        if victim is None:
+            frame = self.free_frames.pop()
+        else:
+            self.evictions += 1
+            self.tlb.pop(victim, None)
+            frame = self.page_tables[victim >> 20].unmap(victim & 0xFFFFF)
+        table.map(vpn, frame)
+        return frame
+    
+    def run(self, references):
+        """Feed an iterable of (pid, vaddr) references; returns stats()"""
+        access = self.access
+        for pid, vaddr in references:
+            access(pid, vaddr)
+        return self.stats()
+    
+    def release(self, pid):
+        """Drop an address space, returning its frames to the pool"""
+        table = self.page_tables.pop(pid, None)
+        if table is None:
+            return
+        for vpn, frame in table.entries():
+            key = (pid << 20) | vpn
+            self.policy.remove(key)
+            self.tlb.pop(key, None)
+            self.free_frames.append(frame)
+    
+    def stats(self):
+        refs = self.references
+        return {
+            "replacement": self.policy.name,
+            "frames": self.frames,
+            "tlb_entries": self.tlb_entries,
+            "references": refs,
+            "kernel_references": self.kernel_references,
+            "tlb_hit_rate": self.tlb_hits / refs if refs else 0.0,
+            "page_faults": self.page_faults,
+            "page_hit_rate": 1 - self.page_faults / refs if refs else 0.0,
+            "evictions": self.evictions,
+            "resident_pages": self.frames - len(self.free_frames),
+        }
+
+MEMREF_MAGIC = b"OSMREF1\n"
+
+def write_reference_trace(path, references):
+    """Write (pid, vaddr) pairs as 'pid 0xaddr' text, or packed uint32 pairs for non-.txt paths"""
+    count = 0
+    if path.endswith(".txt"):
+        with open(path, "w") as f:
+            for pid, vaddr in references:
+                f.write(f"{pid} {vaddr:#x}\n")
+                count += 1
+        return count
+    with open(path, "wb") as f:
+        f.write(MEMREF_MAGIC)
+        chunk = array("I")
+        for pid, vaddr in references:
+            chunk.append(pid)
+            chunk.append(vaddr)
+            count += 1
+            if len(chunk) >= 1 << 16:
+                chunk.tofile(f)
+                del chunk[:]
+        chunk.tofile(f)
+    return count
+
+def read_reference_trace(path, chunk_pairs=1 << 15):
+    """Yield (pid, vaddr) pairs lazily from a text or binary reference trace"""
+    with open(path, "rb") as f:
+        if f.read(len(MEMREF_MAGIC)) != MEMREF_MAGIC:
+            f.seek(0)
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2:
+                    yield int(fields[0]), int(fields[1], 0)
+            return
+        while True:
+            chunk = array("I")
+            try:
+                chunk.fromfile(f, 2 * chunk_pairs)
+            except EOFError:
+                pass
+            if not chunk:
+                return
+            yield from zip(chunk[0::2], chunk[1::2])
+
+def reference_workload(count, processes=4, pages_per_process=4096, working_set=64,
+                       locality=0.9, switch_every=1000, kernel_fraction=0.05, seed=None):
+    """Synthetic references: each process mostly hits a drifting hot set"""
+    rng = random.Random(seed)
+    bases = [rng.randrange(pages_per_process - working_set) for _ in range(processes)]
+    pid = 1
+    for i in range(count):
+        if i % switch_every == 0:
+            pid = rng.randrange(processes) + 1
+            bases[pid - 1] = (bases[pid - 1] + rng.randrange(working_set // 4 + 1)) % (pages_per_process - working_set)
+        roll = rng.random()
+        if roll < kernel_fraction:
+            yield pid, KERNEL_SPACE_START + rng.randrange(1 << 20) * 4
+        elif roll < locality:
+            yield pid, ((bases[pid - 1] + rng.randrange(working_set)) << PAGE_SHIFT) | rng.randrange(PAGE_SIZE)
+        else:
+            yield pid, (rng.randrange(pages_per_process) << PAGE_SHIFT) | rng.randrange(PAGE_SIZE)
+
+FILE_TYPE_FILE = 0
+FILE_TYPE_DIRECTORY = 1
+DIRECT_BLOCKS = 12
+INODE_SIZE = 128
+DIRENT_SIZE = 260
+NAME_MAX = 256
+FS_MAGIC = 0x4F534653
+SUPERBLOCK_STRUCT = struct.Struct("<7I")
+INODE_STRUCT = struct.Struct("<4I2Q12I2I")
+DIRENT_STRUCT = struct.Struct(f"<I{NAME_MAX}s")
+EXTENT_STRUCT = struct.Struct("<2I")
+JOURNAL_HEADER = struct.Struct("<5I")
+JOURNAL_MAGIC = 0x4A524E4C
+STREAM_CHUNK = 64 * 1024
+
+class FileSystemError(Exception):
+    pass
+
+class Superblock:
+    def __init__(self, total_blocks, total_inodes, block_size):
+        self.total_blocks = total_blocks
+        self.free_blocks = total_blocks
+        self.total_inodes = total_inodes
+        self.free_inodes = total_inodes
+        self.block_size = block_size
+
+class Inode:
+    """Mirror of the Inode struct in drivers/include/defs.h
+    
+    extents is the in-memory list of [start, length] block runs in file
+    order; block_pointers/indirect_block are derived from it as on disk.
+    Directories also keep entries, a name -> inode number dict.
+    """
+    
+    __slots__ = ("inode_number", "file_type", "size", "permissions", "created", "modified",
+                 "block_pointers", "indirect_block", "hard_link_count", "extents", "block_count",
+                 "entries", "parent")
+    
+    def __init__(self, inode_number, file_type, permissions, parent=0):
+        now = int(time.time())
+        self.inode_number = inode_number
+        self.file_type = file_type
+        self.size = 0
+        self.permissions = permissions
+        self.created = now
+        self.modified = now
+        self.block_pointers = [0] * DIRECT_BLOCKS
+        self.indirect_block = 0
+        self.hard_link_count = 2 if file_type == FILE_TYPE_DIRECTORY else 1
+        self.extents = []
+        self.block_count = 0
+        self.entries = {} if file_type == FILE_TYPE_DIRECTORY else None
+        self.parent = parent
+    
+    @property
+    def is_directory(self):
+        return self.file_type == FILE_TYPE_DIRECTORY
+    
+    @property
+    def blocks(self):
+        return [block for start, length in self.extents for block in range(start, start + length)]
+    
+    def runs(self, first, count):
+        """(block, length) runs covering file blocks first..first+count-1"""
+        index = 0
+        for start, length in self.extents:
+            if count <= 0:
+                return
+            if first < index + length:
+                skip = max(first - index, 0)
+                take = min(length - skip, count)
+                yield start + skip, take
+                count -= take
+                first += take
+            index += length
+
+def pack_bits(byte_map):
+    """One-byte-per-entry map -> kernel bitmap (bit i % 8 of byte i / 8)"""
+    packed = bytearray((len(byte_map) + 7) // 8)
+    for bit in range(8):
+        column = byte_map[bit::8]
+        for index, used in enumerate(column):
+            if used:
+                packed[index] |= 1 << bit
+    return packed
+
+def unpack_bits(packed, count):
+    byte_map = bytearray(count)
+    for bit in range(8):
+        column = bytes((value >> bit) & 1 for value in packed[:(count - bit + 7) // 8])
+        byte_map[bit::8] = column
+    return byte_map
+
+def append_extent(extents, start, length):
+    """Append a block run, merging it into the last extent when contiguous"""
+    if extents and extents[-1][0] + extents[-1][1] == start:
+        extents[-1][1] += length
+    else:
+        extents.append([start, length])
+
+def read_host_file(path, chunk_size=STREAM_CHUNK):
+    """Iterator over a host file's bytes in chunk_size pieces
+    
+    The file is opened before returning, so a missing or unreadable source
+    fails before a copy opens (and truncates) its destination.
+    """
+    f = open(path, "rb")
+    
+    def chunks():
+        with f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+    return chunks()
+
+class MemoryBlockDevice:
+    """Sparse RAM block device; unwritten blocks read back as zeros"""
+    
+    def __init__(self, total_blocks, block_size):
+        self.total_blocks = total_blocks
+        self.block_size = block_size
+        self.blocks = {}
+        self.zero = bytes(block_size)
+    
+    def read(self, block):
+        data = self.blocks.get(block)
+        return memoryview(self.zero if data is None else data)
+    
+    def write(self, block, data, offset=0):
+        buffer = self.blocks.get(block)
+        if buffer is None:
+            buffer = self.blocks[block] = bytearray(self.block_size)
+        buffer[offset:offset + len(data)] = data
+    
+    def flush(self):
+        return 0
+    
+    def close(self):
+        pass
+
+class DiskImage:
+    """Fixed-size image file mapped with mmap
+    
+    read() returns a memoryview straight into the mapping, so nothing is
+    copied at boot. write() records the block as dirty and flush() msyncs
+    only the dirty ranges.
+    """
+    
+    def __init__(self, path, total_blocks=8192, block_size=4096):
+        self.path = path
+        self.total_blocks = total_blocks
+        self.block_size = block_size
+        size = total_blocks * block_size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        existing = os.fstat(self.fd).st_size
+        if existing and existing != size:
+            os.close(self.fd)
+            raise FileSystemError(f"Image is {existing // block_size} blocks; expected "
+                                  f"{total_blocks} (see --fs-blocks)")
+        if existing < size:
+            os.ftruncate(self.fd, size)
+        self.map = mmap.mmap(self.fd, size)
+        self.view = memoryview(self.map)
+        self.dirty = set()
+    
+    def read(self, block):
+        start = block * self.block_size
+        return self.view[start:start + self.block_size]
+    
+    def write(self, block, data, offset=0):
+        start = block * self.block_size + offset
+        self.map[start:start + len(data)] = data
+        self.dirty.add(block)
+    
+    def flush(self):
+        """msync dirty blocks, coalescing adjacent ones; returns blocks flushed"""
+        if not self.dirty:
+            return 0
+        granularity = mmap.ALLOCATIONGRANULARITY
+        blocks = sorted(self.dirty)
+        run_start = previous = blocks[0]
+        for block in blocks[1:] + [None]:
+            if block is not None and block == previous + 1:
+                previous = block
+                continue
+            start = run_start * self.block_size
+            aligned = start - start % granularity
+            self.map.flush(aligned, (previous + 1) * self.block_size - aligned)
+            if block is not None:
+                run_start = previous = block
+        flushed = len(self.dirty)
+        self.dirty.clear()
+        return flushed
+    
+    def close(self):
+        self.flush()
+        self.view.release()
+        self.map.close()
+        os.close(self.fd)
+
+class BufferCache:
+    """Write-back block cache with the same read/write/flush interface as a device
+    
+    "2q" admits new blocks to a FIFO (a1in) and promotes them to the LRU (am)
+    only on a re-reference remembered by the a1out ghost list, so one-off
+    scans do not flush the hot set. Dirty blocks are written back on
+    eviction, on flush(), once max_dirty is exceeded, and flush_interval
+    seconds after the last write-back (checked on writes and from
+    OSSimulator.idle).
+    """
+    
+    def __init__(self, device, capacity=256, policy="lru", readahead=8,
+                 max_dirty=64, flush_interval=5.0):
+        if policy not in ("lru", "2q"):
+            raise ValueError(f"unknown cache policy: {policy}")
+        self.device = device
+        self.block_size = device.block_size
+        self.total_blocks = device.total_blocks
+        self.capacity = max(1, capacity)
+        self.policy = policy
+        self.readahead = readahead
+        self.max_dirty = max_dirty
+        self.flush_interval = flush_interval
+        self.am = OrderedDict()
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.kin = max(1, self.capacity // 4)
+        self.kout = max(1, self.capacity // 2)
+        self.dirty = set()
+        self.prefetched = set()
+        self.last_read = -2
+        self.last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.readahead_blocks = 0
+        self.readahead_hits = 0
+    
+    def __len__(self):
+        return len(self.am) + len(self.a1in)
+    
+    def _lookup(self, block):
+        buffer = self.am.get(block)
+        if buffer is not None:
+            self.am.move_to_end(block)
+            return buffer
+        return self.a1in.get(block)
+    
+    def _peek(self, block):
+        """Cached buffer or None, without counting as a reference"""
+        buffer = self.am.get(block)
+        return buffer if buffer is not None else self.a1in.get(block)
+    
+    def _insert(self, block, buffer):
+        while len(self) >= self.capacity:
+            self._evict()
+        if self.policy == "2q" and block not in self.a1out:
+            self.a1in[block] = buffer
+        else:
+            self.a1out.pop(block, None)
+            self.am[block] = buffer
+    
+    def _evict(self):
+        if self.policy == "2q" and (len(self.a1in) > self.kin or not self.am):
+            block, buffer = self.a1in.popitem(last=False)
+            self.a1out[block] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            block, buffer = self.am.popitem(last=False)
+        self.evictions += 1
+        self.prefetched.discard(block)
+        if block in self.dirty:
+            self.dirty.discard(block)
+            self.device.write(block, buffer)
+            self.writebacks += 1
+    
+    def _load(self, block):
+        buffer = bytearray(self.device.read(block))
+        self._insert(block, buffer)
+        return buffer
+    
+    def read(self, block):
+        buffer = self._lookup(block)
+        if buffer is not None:
+            self.hits += 1
+            if block in self.prefetched:
+                self.prefetched.discard(block)
+                self.readahead_hits += 1
+        else:
+            self.misses += 1
+            buffer = self._load(block)
+        if block == self.last_read + 1 and self.readahead:
+            self._read_ahead(block + 1)
+        self.last_read = block
+        return memoryview(buffer)
+    
+    def _read_ahead(self, start):
+        if self._peek(start) is not None:
+            return
+        end = min(start + self.readahead, self.total_blocks)
+        for block in range(start, end):
+            if self._peek(block) is None:
+                self._load(block)
+                self.prefetched.add(block)
+                self.readahead_blocks += 1
+    
+    def write(self, block, data, offset=0):
+        buffer = self._lookup(block)
+        if buffer is None:
+            if offset == 0 and len(data) >= self.block_size:
+                buffer = bytearray(self.block_size)
+                self._insert(block, buffer)
+            else:
+                buffer = self._load(block)
+        buffer[offset:offset + len(data)] = data
+        self.dirty.add(block)
+        if len(self.dirty) >= self.max_dirty:
+            self.write_back()
+        else:
+            self.write_back_if_due()
+    
+    def write_back_if_due(self):
+        """Periodic flush: write back once flush_interval has passed since the last one"""
+        if self.dirty and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.write_back()
+    
+    def write_back(self):
+        """Write every dirty block to the device without evicting it"""
+        for block in sorted(self.dirty):
+            self.device.write(block, self._peek(block))
+            self.writebacks += 1
+        self.dirty.clear()
+        self.last_flush = time.monotonic()
+    
+    def flush(self):
+        self.write_back()
+        return self.device.flush()
+    
+    def close(self):
+        self.write_back()
+        self.device.close()
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "capacity": self.capacity,
+            "cached": len(self),
+            "dirty": len(self.dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "writebacks": self.writebacks,
+            "readahead_blocks": self.readahead_blocks,
+            "readahead_hits": self.readahead_hits,
+        }
+
+class Journal:
+    """Append-only redo log of metadata block images, replayed at boot
+    
+    Each transaction is one record: a header (magic, sequence, block count,
+    block size, CRC-32 of the payload), the block numbers, then the full
+    block images. Replay stops at the first record whose CRC fails, so a
+    torn append is ignored. Operations are group committed: operation()
+    reports when group_size operations have piled up or the group has been
+    open group_interval seconds by the time another one arrives, and each
+    commit costs one fsync however many operations it holds. The clock is
+    only read on operations, so callers commit an open group themselves
+    when they go idle (OSSimulator.idle).
+    checkpoint() empties the log once the device itself has been flushed.
+    """
+    
+    def __init__(self, path, group_size=64, group_interval=0.5):
+        self.path = path
+        self.file = self._open(path)
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.pending = 0
+        self.group_started = 0.0
+        self.sequence = 0
+        self.checkpointed = 0
+        self.commits = 0
+        self.operations = 0
+        self.fsyncs = 0
+        self.bytes_written = 0
+    
+    def _open(self, path):
+        return open(path, "a+b")
+    
+    def _fsync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.fsyncs += 1
+    
+    def operation(self):
+        """Count one metadata operation; True when the group should commit"""
+        now = time.monotonic()
+        if not self.pending:
+            self.group_started = now
+        self.pending += 1
+        self.operations += 1
+        return self.pending >= self.group_size or now - self.group_started >= self.group_interval
+    
+    def append(self, staged):
+        """Durably log one transaction of {block: image}"""
+        blocks = sorted(staged)
+        payload = array("I", blocks).tobytes() + b"".join(staged[block] for block in blocks)
+        block_size = len(staged[blocks[0]]) if blocks else 0
+        self.sequence += 1
+        record = JOURNAL_HEADER.pack(JOURNAL_MAGIC, self.sequence, len(blocks), block_size,
+                                     zlib.crc32(payload)) + payload
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(record)
+        self._fsync()
+        self.bytes_written += len(record)
+        self.commits += 1
+        self.pending = 0
+    
+    def transactions(self):
+        """Yield (sequence, {block: image}) for each intact record, oldest first"""
+        self.file.seek(0)
+        data = memoryview(self.file.read())
+        position = 0
+        while position + JOURNAL_HEADER.size <= len(data):
+            magic, sequence, count, block_size, checksum = JOURNAL_HEADER.unpack_from(data, position)
+            start = position + JOURNAL_HEADER.size
+            end = start + count * (4 + block_size)
+            if magic != JOURNAL_MAGIC or end > len(data) or zlib.crc32(data[start:end]) != checksum:
+                return
+            numbers = array("I")
+            numbers.frombytes(data[start:start + 4 * count])
+            images = start + 4 * count
+            yield sequence, {block: data[images + index * block_size:images + (index + 1) * block_size]
+                             for index, block in enumerate(numbers)}
+            position = end
+    
+    def replay(self, device):
+        """Redo every committed transaction on device, flush it and empty the log"""
+        self.sequence = self.checkpointed
+        replayed = 0
+        for sequence, staged in self.transactions():
+            for block, image in staged.items():
+                device.write(block, image)
+            self.sequence = sequence
+            replayed += 1
+        if replayed:
+            device.flush()
+        self.checkpoint()
+        return replayed
+    
+    def latest(self, block):
+        """Newest committed image of block in the log, or None"""
+        image = None
+        for _, staged in self.transactions():
+            image = staged.get(block, image)
+        return image
+    
+    def checkpoint(self):
+        """Empty the log once the device durably holds everything in it"""
+        self.checkpointed = self.sequence
+        self.file.seek(0)
+        self.file.truncate()
+        self._fsync()
+    
+    def stats(self):
+        return {
+            "commits": self.commits,
+            "operations": self.operations,
+            "fsyncs": self.fsyncs,
+            "bytes_written": self.bytes_written,
+            "pending": self.pending,
+        }
+    
+    def close(self):
+        self.file.close()
+
+class SimulatedCrash(Exception):
+    pass
+
+class CrashPoint:
+    """Raises SimulatedCrash on the countdown'th device or journal write"""
+    
+    def __init__(self, countdown):
+        self.countdown = countdown
+    
+    def tick(self):
+        self.countdown -= 1
+        if self.countdown == 0:
+            raise SimulatedCrash()
+
+class VolatileBlockDevice(MemoryBlockDevice):
+    """RAM device whose writes only become durable on flush()
+    
+    crash() keeps a random subset of the unflushed writes, as a disk
+    with a volatile write cache may, and drops the rest.
+    """
+    
+    def __init__(self, total_blocks, block_size, crash_point):
+        super().__init__(total_blocks, block_size)
+        self.crash_point = crash_point
+        self.pending = {}
+    
+    def read(self, block):
+        data = self.pending.get(block)
+        return memoryview(data) if data is not None else super().read(block)
+    
+    def write(self, block, data, offset=0):
+        self.crash_point.tick()
+        buffer = self.pending.get(block)
+        if buffer is None:
+            buffer = self.pending[block] = bytearray(super().read(block))
+        buffer[offset:offset + len(data)] = data
+    
+    def flush(self):
+        self.crash_point.tick()
+        for block, data in self.pending.items():
+            super().write(block, data)
+        flushed = len(self.pending)
+        self.pending.clear()
+        return flushed
+    
+    def crash(self, rng):
+        for block, data in self.pending.items():
+            if rng.random() < 0.5:
+                super().write(block, data)
+        self.pending.clear()
+
+class VolatileJournal(Journal):
+    """In-memory journal whose appends only become durable on fsync
+    
+    crash() keeps the durable prefix plus a torn, random-length piece of
+    whatever was written after it.
+    """
+    
+    def __init__(self, crash_point, group_size=64):
+        self.crash_point = crash_point
+        self.durable = 0
+        super().__init__(None, group_size, float("inf"))
+    
+    def _open(self, path):
+        return io.BytesIO()
+    
+    def _fsync(self):
+        self.crash_point.tick()
+        self.durable = len(self.file.getbuffer())
+        self.fsyncs += 1
+    
+    def crash(self, rng):
+        end = len(self.file.getbuffer())
+        self.file.truncate(rng.randint(min(self.durable, end), end))
+        self.pending = 0
+
+class FileSystem:
+    """Model of kernel/filesystem.c over a block device
+    
+    Superblock, inode table, inode and block bitmaps. Data is allocated in
+    extents (contiguous runs taken from the block bitmap in one slice);
+    the 12 direct pointers hold a file's first blocks and its indirect
+    block holds an extent table for the rest. Directories are indexed
+    by name, so listing one costs O(children), and resolved paths are
+    cached until the entry is removed.
+    
+    On-disk layout, in block_size blocks:
+      0                 superblock: the C Superblock fields, magic, data_start
+      1..               block bitmap, then inode bitmap (kernel bit order)
+      ..data_start-1    inode table, 128-byte slots holding the defs.h Inode
+      indirect blocks   (start, length) uint32 pairs for blocks past the 12th
+      data_start..      data; directories are packed DirectoryEntry arrays
+    Block 0 is never a data block, so 0 doubles as the null pointer.
+    Mutations only mark inodes, directories and bitmaps dirty. commit()
+    serializes them into block images, logs those to the journal (if any)
+    and writes them to the device; with a journal, commits happen every
+    group of operations. sync() commits, flushes the device and empties
+    the journal. Inodes are loaded lazily from an existing image the
+    first time a path reaches them.
+    """
+    
+    def __init__(self, total_blocks=8192, total_inodes=512, block_size=4096, device=None, journal=None):
+        self.block_size = block_size
+        self.device = device if device is not None else MemoryBlockDevice(total_blocks, block_size)
+        self.journal = journal
+        # Check geometry against the superblock replay would leave behind
+        # before replay writes anything to the device or empties the log
+        image = journal.latest(0) if journal is not None else None
+        header = SUPERBLOCK_STRUCT.unpack_from(image if image is not None else self.device.read(0))
+        if header[5] == FS_MAGIC and (header[0], header[2], header[4]) != (total_blocks, total_inodes, block_size):
+            raise FileSystemError(f"Image geometry is {header[0]} blocks, {header[2]} inodes, "
+                                  f"{header[4]}-byte blocks; expected {total_blocks}, "
+                                  f"{total_inodes}, {block_size} (see --fs-blocks)")
+        self.recovered = journal.replay(self.device) if journal is not None else 0
+        self.superblock = Superblock(total_blocks, total_inodes, block_size)
+        self.block_bitmap_start = 1
+        self.inode_bitmap_start = self.block_bitmap_start + -(-total_blocks // 8 // block_size)
+        self.inode_table_start = self.inode_bitmap_start + -(-total_inodes // 8 // block_size)
+        self.data_start = self.inode_table_start + -(-total_inodes * INODE_SIZE // block_size)
+        self.max_extents = block_size // EXTENT_STRUCT.size
+        self.inodes = {}
+        self.path_cache = {"/": 0}
+        self.block_hint = self.data_start
+        self.inode_hint = 1
+        self.dirty_inodes = set()
+        self.dirty_directories = set()
+        self.freed_inodes = set()
+        self.bitmaps_dirty = False
+        
+        header = SUPERBLOCK_STRUCT.unpack_from(self.device.read(0))
+        self.formatted = header[5] != FS_MAGIC
+        if self.formatted:
+            self._format()
+        else:
+            self._load(header)
+    
+    def _format(self):
+        sb = self.superblock
+        self.inode_map = bytearray(sb.total_inodes)
+        self.block_map = bytearray(sb.total_blocks)
+        self.block_map[:self.data_start] = b"\x01" * self.data_start
+        sb.free_blocks -= self.data_start
+        root = Inode(0, FILE_TYPE_DIRECTORY, 0o755)
+        self.inode_map[0] = 1
+        sb.free_inodes -= 1
+        self.inodes[0] = root
+        self.dirty_inodes.add(0)
+        self.dirty_directories.add(0)
+        self.bitmaps_dirty = True
+    
+    def _load(self, header):
+        sb = self.superblock
+        sb.free_blocks, sb.free_inodes = header[1], header[3]
+        self.block_map = unpack_bits(self._read_region(self.block_bitmap_start, -(-sb.total_blocks // 8)),
+                                     sb.total_blocks)
+        self.inode_map = unpack_bits(self._read_region(self.inode_bitmap_start, -(-sb.total_inodes // 8)),
+                                     sb.total_inodes)
+        self._inode(0, 0)
+    
+    def _read_region(self, first, size):
+        read = self.device.read
+        return b"".join(read(first + index) for index in range(-(-size // self.block_size)))[:size]
+    
+    def _read_stream(self, inode):
+        return b"".join(self.read_chunks(inode))
+    
+    def _inode(self, ino, parent):
+        """Cached inode, loading it from the inode table on first use"""
+        inode = self.inodes.get(ino)
+        if inode is not None:
+            return inode
+        offset = ino * INODE_SIZE
+        slot = self.device.read(self.inode_table_start + offset // self.block_size)
+        fields = INODE_STRUCT.unpack_from(slot, offset % self.block_size)
+        inode = Inode(ino, fields[1], fields[3], parent)
+        inode.size, inode.created, inode.modified = fields[2], fields[4], fields[5]
+        inode.block_pointers = list(fields[6:18])
+        inode.indirect_block, inode.hard_link_count = fields[18], fields[19]
+        count = -(-inode.size // self.block_size)
+        for block in inode.block_pointers[:min(count, DIRECT_BLOCKS)]:
+            append_extent(inode.extents, block, 1)
+        if count > DIRECT_BLOCKS:
+            table = self.device.read(inode.indirect_block)
+            remaining = count - DIRECT_BLOCKS
+            for start, length in EXTENT_STRUCT.iter_unpack(table):
+                if remaining <= 0:
+                    break
+                append_extent(inode.extents, start, length)
+                remaining -= length
+        inode.block_count = count
+        if (sum(length for _, length in inode.extents) != count
+                or any(start < self.data_start or start + length > self.superblock.total_blocks
+                       for start, length in inode.extents)):
+            raise FileSystemError(f"Corrupt inode {ino}")
+        if inode.is_directory:
+            stream = self._read_stream(inode)
+            for entry in range(len(stream) // DIRENT_SIZE):
+                child, name = DIRENT_STRUCT.unpack_from(stream, entry * DIRENT_SIZE)
+                inode.entries[name.rstrip(b"\x00").decode()] = child
+        self.inodes[ino] = inode
+        return inode
+    
+    def _stage(self):
+        """Serialize dirty metadata into {block: full block image}"""
+        staged = {}
+        block_size = self.block_size
+        read = self.device.read
+        
+        def write(block, data, offset=0):
+            buffer = staged.get(block)
+            if buffer is None:
+                whole = offset == 0 and len(data) == block_size
+                buffer = staged[block] = bytearray(block_size) if whole else bytearray(read(block))
+            buffer[offset:offset + len(data)] = data
+        
+        sb = self.superblock
+        write(0, SUPERBLOCK_STRUCT.pack(sb.total_blocks, sb.free_blocks, sb.total_inodes,
+                                        sb.free_inodes, sb.block_size, FS_MAGIC, self.data_start))
+        if self.bitmaps_dirty:
+            for first, byte_map in ((self.block_bitmap_start, self.block_map),
+                                    (self.inode_bitmap_start, self.inode_map)):
+                packed = pack_bits(byte_map)
+                for index in range(0, len(packed), block_size):
+                    write(first + index // block_size, packed[index:index + block_size])
+            self.bitmaps_dirty = False
+        for ino in self.freed_inodes - self.dirty_inodes:
+            offset = ino * INODE_SIZE
+            write(self.inode_table_start + offset // block_size, bytes(INODE_SIZE), offset % block_size)
+        for ino in self.dirty_directories:
+            inode = self.inodes.get(ino)
+            if inode is not None:
+                stream = b"".join(DIRENT_STRUCT.pack(child, name.encode())
+                                  for name, child in inode.entries.items())
+                for index, block in enumerate(inode.blocks):
+                    write(block, stream[index * block_size:(index + 1) * block_size])
+        for ino in self.dirty_inodes:
+            inode = self.inodes.get(ino)
+            if inode is None:
+                continue
+            offset = ino * INODE_SIZE
+            write(self.inode_table_start + offset // block_size, INODE_STRUCT.pack(
+                ino, inode.file_type, inode.size, inode.permissions, inode.created,
+                inode.modified, *inode.block_pointers, inode.indirect_block, inode.hard_link_count),
+                offset % block_size)
+            if inode.indirect_block:
+                table = self._tail_extents(inode)
+                write(inode.indirect_block, b"".join(EXTENT_STRUCT.pack(*run) for run in table))
+        self.dirty_inodes.clear()
+        self.dirty_directories.clear()
+        self.freed_inodes.clear()
+        return staged
+    
+    def commit(self):
+        """Log dirty metadata as one journal transaction, then apply it to the device"""
+        staged = self._stage()
+        if self.journal is not None:
+            self.journal.append(staged)
+        write = self.device.write
+        for block, data in staged.items():
+            write(block, data)
+    
+    def _logged(self):
+        """Count a metadata operation towards the current group commit"""
+        if self.journal is not None and self.journal.operation():
+            self.commit()
+    
+    def commit_pending(self):
+        """Commit the open group commit, if any operations are waiting in it"""
+        if self.journal is not None and self.journal.pending:
+            self.commit()
+    
+    def sync(self):
+        """Commit dirty metadata, flush the device and checkpoint the journal; returns blocks flushed"""
+        self.commit()
+        flushed = self.device.flush()
+        if self.journal is not None:
+            self.journal.checkpoint()
+        return flushed
+    
+    def close(self):
+        self.sync()
+        self.device.close()
+        if self.journal is not None:
+            self.journal.close()
+    
+    @staticmethod
+    def normalize(path, cwd="/"):
+        if not path.startswith("/"):
+            path = cwd.rstrip("/") + "/" + path
+        parts = []
+        for part in path.split("/"):
+            if part == "..":
+                if parts:
+                    parts.pop()
+            elif part and part != ".":
+                parts.append(part)
+        return "/" + "/".join(parts)
+    
+    def resolve(self, path):
+        """Inode for a normalized absolute path, or None"""
+        ino = self.path_cache.get(path)
+        if ino is not None:
+            return self.inodes[ino]
+        parent_path, _, name = path.rpartition("/")
+        parent = self.resolve(parent_path or "/")
+        if parent is None or not parent.is_directory:
+            return None
+        ino = parent.entries.get(name)
+        if ino is None:
+            return None
+        self.path_cache[path] = ino
+        return self._inode(ino, parent.inode_number)
+    
+    def _allocate_inode(self):
+        ino = self.inode_map.find(0, self.inode_hint)
+        if ino < 0:
+            raise FileSystemError("No free inodes")
+        self.inode_map[ino] = 1
+        self.inode_hint = ino + 1
+        self.superblock.free_inodes -= 1
+        self.bitmaps_dirty = True
+        return ino
+    
+    def _free_inode(self, ino):
+        self.inode_map[ino] = 0
+        self.inode_hint = min(self.inode_hint, ino)
+        self.superblock.free_inodes += 1
+        self.bitmaps_dirty = True
+        self.freed_inodes.add(ino)
+        self.dirty_inodes.discard(ino)
+        self.dirty_directories.discard(ino)
+        del self.inodes[ino]
+    
+    def allocate_extent(self, count):
+        """Claim up to count contiguous free blocks; returns (start, length)"""
+        start = self.block_map.find(0, self.block_hint)
+        if start < 0:
+            raise FileSystemError("No free blocks")
+        end = self.block_map.find(1, start, start + count)
+        if end < 0:
+            end = min(start + count, len(self.block_map))
+        length = end - start
+        self.block_map[start:end] = b"\x01" * length
+        self.block_hint = end
+        self.superblock.free_blocks -= length
+        self.bitmaps_dirty = True
+        return start, length
+    
+    def free_extent(self, start, length):
+        self.block_map[start:start + length] = bytes(length)
+        self.block_hint = min(self.block_hint, start)
+        self.superblock.free_blocks += length
+        self.bitmaps_dirty = True
     
-    def __repr__(self):
-        return f"{self.pid}\t{self.name:<15}\t{self.state.value:<8}\t{self.priority}"
+    def allocate_block(self):
+        return self.allocate_extent(1)[0]
+    
+    def free_block(self, block):
+        self.free_extent(block, 1)
+    
+    def _tail_extents(self, inode):
+        """Extents covering the blocks after the direct pointers"""
+        return list(inode.runs(DIRECT_BLOCKS, inode.block_count - DIRECT_BLOCKS))
+    
+    def _grow(self, inode, count):
+        while count:
+            start, length = self.allocate_extent(count)
+            append_extent(inode.extents, start, length)
+            inode.block_count += length
+            count -= length
+    
+    def _shrink(self, inode, keep):
+        extents = inode.extents
+        while inode.block_count > keep:
+            start, length = extents[-1]
+            drop = min(length, inode.block_count - keep)
+            self.free_extent(start + length - drop, drop)
+            if drop == length:
+                extents.pop()
+            else:
+                extents[-1][1] -= drop
+            inode.block_count -= drop
+    
+    def resize(self, inode, size):
+        """Grow or shrink an inode's extents to cover size bytes"""
+        needed = -(-size // self.block_size)
+        count = inode.block_count
+        indirect = needed > DIRECT_BLOCKS
+        if needed - count + (indirect and not inode.indirect_block) > self.superblock.free_blocks:
+            raise FileSystemError("No free blocks")
+        if indirect and not inode.indirect_block:
+            inode.indirect_block = self.allocate_block()
+        if needed > count:
+            self._grow(inode, needed - count)
+            if indirect and len(self._tail_extents(inode)) > self.max_extents:
+                self._shrink(inode, count)
+                if count <= DIRECT_BLOCKS:
+                    self.free_block(inode.indirect_block)
+                    inode.indirect_block = 0
+                raise FileSystemError("File too fragmented")
+        elif needed < count:
+            self._shrink(inode, needed)
+        if not indirect and inode.indirect_block:
+            self.free_block(inode.indirect_block)
+            inode.indirect_block = 0
+        direct = [block for start, length in inode.runs(0, min(needed, DIRECT_BLOCKS))
+                  for block in range(start, start + length)]
+        inode.block_pointers = direct + [0] * (DIRECT_BLOCKS - len(direct))
+        inode.size = size
+        inode.modified = int(time.time())
+        self.dirty_inodes.add(inode.inode_number)
+    
+    def read_chunks(self, inode, chunk_size=STREAM_CHUNK):
+        """Yield a file's bytes in chunk_size pieces, block runs at a time"""
+        read = self.device.read
+        per_chunk = max(1, chunk_size // self.block_size)
+        remaining = inode.size
+        first = 0
+        while remaining > 0:
+            count = min(per_chunk, inode.block_count - first)
+            if count <= 0:
+                return
+            chunk = b"".join(read(block) for start, length in inode.runs(first, count)
+                             for block in range(start, start + length))[:remaining]
+            remaining -= len(chunk)
+            first += count
+            yield chunk
+    
+    def write_chunks(self, inode, chunks, append=False):
+        """Write an iterable of byte chunks to a file; returns bytes written"""
+        if inode.is_directory:
+            raise IsADirectoryError(inode.inode_number)
+        if not append:
+            self.resize(inode, 0)
+        write = self.device.write
+        block_size = self.block_size
+        written = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            offset = inode.size
+            self.resize(inode, offset + len(chunk))
+            view = memoryview(chunk)
+            first, within = divmod(offset, block_size)
+            position = 0
+            for start, length in inode.runs(first, inode.block_count - first):
+                for block in range(start, start + length):
+                    piece = view[position:position + block_size - within]
+                    write(block, piece, within)
+                    position += len(piece)
+                    within = 0
+            written += len(chunk)
+        self._logged()
+        return written
+    
+    def create(self, path, file_type, permissions=None, size=0):
+        parent_path, _, name = path.rpartition("/")
+        parent = self.resolve(parent_path or "/")
+        if parent is None or not parent.is_directory:
+            raise FileSystemError(f"No such directory: {parent_path or '/'}")
+        if not name:
+            raise FileSystemError("Invalid name")
+        if len(name.encode()) > NAME_MAX:
+            raise FileSystemError(f"Name longer than {NAME_MAX} bytes: {name[:32]}...")
+        if name in parent.entries:
+            raise FileExistsError(path)
+        if permissions is None:
+            permissions = 0o755 if file_type == FILE_TYPE_DIRECTORY else 0o644
+        ino = self._allocate_inode()
+        inode = Inode(ino, file_type, permissions, parent.inode_number)
+        self.inodes[ino] = inode
+        try:
+            self.resize(parent, (len(parent.entries) + 1) * DIRENT_SIZE)
+            if size:
+                self.resize(inode, size)
+        except FileSystemError:
+            self.resize(parent, len(parent.entries) * DIRENT_SIZE)
+            self._free_inode(ino)
+            raise
+        parent.entries[name] = ino
+        if file_type == FILE_TYPE_DIRECTORY:
+            parent.hard_link_count += 1
+            self.dirty_directories.add(ino)
+        self.dirty_directories.add(parent.inode_number)
+        self.dirty_inodes.add(ino)
+        self.path_cache[path] = ino
+        self._logged()
+        return inode
+    
+    def create_file(self, path, size=0):
+        return self.create(path, FILE_TYPE_FILE, size=size)
+    
+    def create_directory(self, path):
+        return self.create(path, FILE_TYPE_DIRECTORY)
+    
+    def delete(self, path):
+        inode = self.resolve(path)
+        if inode is None:
+            raise FileNotFoundError(path)
+        if inode.inode_number == 0:
+            raise FileSystemError("Cannot remove root directory")
+        if inode.is_directory and inode.entries:
+            raise FileSystemError(f"Directory not empty: {path}")
+        parent = self.inodes[inode.parent]
+        del parent.entries[path.rpartition("/")[2]]
+        self.dirty_directories.add(parent.inode_number)
+        if inode.is_directory:
+            parent.hard_link_count -= 1
+        self.resize(parent, len(parent.entries) * DIRENT_SIZE)
+        self.resize(inode, 0)
+        self._free_inode(inode.inode_number)
+        self.path_cache.pop(path, None)
+        self._logged()
+    
+    def check(self):
+        """fsck: inconsistencies between the namespace, the bitmaps and the superblock"""
+        problems = []
+        sb = self.superblock
+        blocks = bytearray(sb.total_blocks)
+        blocks[:self.data_start] = b"\x01" * self.data_start
+        inodes = bytearray(sb.total_inodes)
+        inodes[0] = 1
+        stack = [("/", self.resolve("/"))]
+        try:
+            while stack:
+                path, inode = stack.pop()
+                if inode.is_directory:
+                    prefix = path.rstrip("/") + "/"
+                    for name, child in inode.entries.items():
+                        if not 0 <= child < sb.total_inodes or inodes[child]:
+                            problems.append(f"{prefix}{name}: inode {child} invalid or linked twice")
+                            continue
+                        inodes[child] = 1
+                        stack.append((prefix + name, self._inode(child, inode.inode_number)))
+                if inode.block_count != -(-inode.size // self.block_size):
+                    problems.append(f"{path}: {inode.block_count} blocks for {inode.size} bytes")
+                runs = inode.extents + ([[inode.indirect_block, 1]] if inode.indirect_block else [])
+                for start, length in runs:
+                    if any(blocks[start:start + length]):
+                        problems.append(f"{path}: blocks {start}-{start + length - 1} already in use")
+                    blocks[start:start + length] = b"\x01" * length
+        except (FileSystemError, ValueError, struct.error) as e:
+            problems.append(f"walk failed: {e}")
+            return problems
+        leaked = sum(1 for used, expected in zip(self.block_map, blocks) if used != expected)
+        if leaked:
+            problems.append(f"block bitmap differs from the namespace in {leaked} blocks")
+        if inodes != self.inode_map:
+            problems.append("inode bitmap differs from the namespace")
+        if sb.free_blocks != self.block_map.count(0):
+            problems.append(f"superblock free_blocks {sb.free_blocks} != {self.block_map.count(0)}")
+        if sb.free_inodes != self.inode_map.count(0):
+            problems.append(f"superblock free_inodes {sb.free_inodes} != {self.inode_map.count(0)}")
+        return problems
+    
+    def list_directory(self, path):
+        """(name, inode) pairs of one directory, in creation order"""
+        inode = self.resolve(path)
+        if inode is None:
+            raise FileNotFoundError(path)
+        if not inode.is_directory:
+            raise NotADirectoryError(path)
+        load = self._inode
+        parent = inode.inode_number
+        return [(name, load(ino, parent)) for name, ino in inode.entries.items()]
+    
+    def walk(self, path="/"):
+        """Yield (path, inode) for path and everything below it"""
+        inode = self.resolve(path)
+        stack = [(path, inode)]
+        while stack:
+            path, inode = stack.pop()
+            yield path, inode
+            if inode.is_directory:
+                prefix = path.rstrip("/") + "/"
+                for name, ino in reversed(list(inode.entries.items())):
+                    stack.append((prefix + name, self._inode(ino, inode.inode_number)))
 
 class OSSimulator:
-    def __init__(self):
-        self.process_table = []
+    def __init__(self, max_processes=None, config=None, scheduler="rr", verbose=True,
+                 physical_pages=None, allocator="first-fit", vm_frames=None, vm_policy="lru",
+                 tlb_entries=64, disk_image=None, cache_blocks=256, cache_policy="lru", group_commit=64):
+        self.verbose = verbose
+        self.config = load_config() if config is None else config
+        self.timer_hz = self.config.get("TIMER_FREQUENCY_HZ", 100)
+        if isinstance(scheduler, str):
+            scheduler = SCHEDULERS[scheduler].from_config(self.config)
+        self.scheduler = scheduler
+        self.process_table = ProcessTable(on_ready=self._make_ready)
         self.next_pid = 1
         self.current_process = None
+        self.idle_process = None
+        self.slice_ticks = 0
+        self.context_switches = 0
+        self.latency_histogram = Counter()
         self.system_ticks = 0
-        self.memory_total_kb = 262144          
-        self.memory_allocated_kb = 256 * 4                  
-        self.max_processes = 256
+        if physical_pages is None:
+            physical_pages = self.config.get("MAX_PHYSICAL_PAGES", 65536)
+        self.physical_pages = physical_pages
+        self.allocator = allocator
+        self.vm_frames = physical_pages - KERNEL_RESERVED_PAGES if vm_frames is None else vm_frames
+        self.vm_policy = vm_policy
+        self.tlb_entries = tlb_entries
+        self.max_processes = self.config.get("MAX_PROCESSES", 256) if max_processes is None else max_processes
         self.start_time = time.time()
+        self.startup_seconds = None
+        self.output = ShellOutput()
+        self.host_files = True  # host:PATH access; off while serving remote sessions
         
-                     
-        self.files = {
-            "/": {"type": "directory", "size": 0},
-            "/system.bin": {"type": "file", "size": 1024},
-            "/kernel.bin": {"type": "file", "size": 2048},
-            "/shell.bin": {"type": "file", "size": 512},
-        }
+        # memory, vm and fs (with its cache and journal) are built on first use
+        self.disk_image = disk_image
+        self.cache_blocks = cache_blocks
+        self.cache_policy = cache_policy
+        self.group_commit = group_commit
         self.current_directory = "/"
         
                              
-        self.create_process("idle", priority=0)
-        self.current_process = self.process_table[0]
+        self.idle_process = self.create_process("idle", priority=0)
+        self.current_process = self.idle_process
         self.current_process.state = ProcessState.RUNNING
+    
+    @cached_property
+    def memory(self):
+        return ALLOCATORS[self.allocator](self.physical_pages)
+    
+    @cached_property
+    def vm(self):
+        return VirtualMemory(self.vm_frames, self.vm_policy, self.tlb_entries)
+    
+    @cached_property
+    def journal(self):
+        return Journal(self.disk_image + ".journal", self.group_commit) if self.disk_image else None
+    
+    @cached_property
+    def buffer_cache(self):
+        total_blocks = self.config.get("MAX_BLOCKS", 8192)
+        block_size = self.config.get("FILESYSTEM_BLOCK_SIZE", 4096)
+        if self.disk_image:
+            device = DiskImage(self.disk_image, total_blocks, block_size)
+        else:
+            device = MemoryBlockDevice(total_blocks, block_size)
+        return BufferCache(device, self.cache_blocks, self.cache_policy)
+    
+    @cached_property
+    def fs(self):
+        fs = FileSystem(self.config.get("MAX_BLOCKS", 8192), self.config.get("MAX_INODES", 512),
+                        self.config.get("FILESYSTEM_BLOCK_SIZE", 4096), self.buffer_cache, self.journal)
+        if fs.recovered and self.verbose:
+            print(f"Recovered {fs.recovered} transactions from the journal")
+        if fs.formatted:
+            fs.create_file("/system.bin", 1024)
+            fs.create_file("/kernel.bin", 2048)
+            fs.create_file("/shell.bin", 512)
+        return fs
+    
+    def idle(self):
+        """Commit an open journal group and run a due cache flush while the shell waits"""
+        if self.initialized("fs"):
+            self.fs.commit_pending()
+        if self.initialized("buffer_cache"):
+            self.buffer_cache.write_back_if_due()
+    
+    def initialized(self, subsystem):
+        """Whether a lazily built subsystem ("memory", "vm", "fs", ...) exists yet"""
+        return subsystem in self.__dict__
 
     def create_process(self, name, priority=0):
         if len(self.process_table) >= self.max_processes:
-            print(f"Error: Maximum process limit reached")
+            if self.verbose:
+                print(f"Error: Maximum process limit reached")
             return None
         
         process = Process(self.next_pid, name, priority)
-        self.process_table.append(process)
+        self.process_table.add(process)
         self.next_pid += 1
-        print(f"Process created: PID={process.pid}, Name='{name}'")
+        if self.verbose:
+            print(f"Process created: PID={process.pid}, Name='{name}'")
         return process
     
+    def get_process(self, pid):
+        return self.process_table.get(pid)
+    
+    def block_process(self, process, state=ProcessState.BLOCKED):
+        """Take a process off the CPU/run queue until wake_process()"""
+        was_running = process is self.current_process
+        process.state = state
+        if was_running:
+            self.schedule()
+    
+    def wake_process(self, process):
+        if process.state in (ProcessState.BLOCKED, ProcessState.WAITING):
+            process.state = ProcessState.READY
+    
+    @property
+    def memory_total_kb(self):
+        return self.memory.total_pages * PAGE_SIZE // 1024
+    
+    @property
+    def memory_allocated_kb(self):
+        return self.memory.used_pages * PAGE_SIZE // 1024
+    
+    def allocate_memory(self, process, size_kb):
+        """Back a process allocation with physical pages; returns the address or 0"""
+        address = self.memory.allocate(size_kb * 1024)
+        if address:
+            process.memory_regions.append((address, size_kb * 1024))
+            process.memory_kb += -(-size_kb // 4) * 4
+        return address
+    
+    def free_process_memory(self, process):
+        for address, size in process.memory_regions:
+            self.memory.free(address, size)
+        process.memory_regions = []
+        process.memory_kb = 0
+    
+    def memory_access(self, process, vaddr):
+        """Translate a virtual address for process through the TLB and its page table"""
+        return self.vm.access(process.pid, vaddr)
+    
+    def terminate_process(self, process, reap=False):
+        was_running = process is self.current_process
+        process.state = ProcessState.TERMINATED
+        self.free_process_memory(process)
+        if self.initialized("vm"):
+            self.vm.release(process.pid)
+        if reap:
+            self.process_table.remove(process.pid)
+        if was_running:
+            self.schedule()
+    
+    def _make_ready(self, process):
+        process.ready_since = self.system_ticks
+        if process is not self.idle_process:
+            self.scheduler.enqueue(process, self.system_ticks)
+    
+    def tick(self):
+        """Advance one timer interrupt and preempt when the scheduler asks"""
+        self.system_ticks += 1
+        self.slice_ticks += 1
+        current = self.current_process
+        current.run_ticks += 1
+        if (current is self.idle_process
+                or self.scheduler.tick(self.system_ticks, current, self.slice_ticks)):
+            self.schedule()
+    
     def schedule(self):
-        """Round-robin scheduling"""
-        if not self.process_table:
+        """Switch to the next process chosen by the active scheduler"""
+        self.slice_ticks = 0
+        current = self.current_process
+        p = self.scheduler.pick_next(self.system_ticks)
+        if p is None:
+            if current is None or current.state is not ProcessState.RUNNING:
+                p = self.idle_process
+            else:
+                return
+        if p is current:
             return
-        
-                                 
-        for p in self.process_table:
-            if p.state == ProcessState.READY:
-                if self.current_process:
-                    self.current_process.state = ProcessState.READY
-                self.current_process = p
-                self.current_process.state = ProcessState.RUNNING
+        if current and current.state is ProcessState.RUNNING:
+            current.state = ProcessState.READY
+        self.current_process = p
+        p.state = ProcessState.RUNNING
+        self.context_switches += 1
+        if p is not self.idle_process:
+            latency = self.system_ticks - p.ready_since
+            p.wait_ticks += latency
+            p.dispatches += 1
+            if latency > p.max_latency:
+                p.max_latency = latency
+            self.latency_histogram[latency] += 1
+    
+    def scheduler_stats(self):
+        """Aggregate dispatch latency (ticks spent READY before running)"""
+        histogram = self.latency_histogram
+        samples = sum(histogram.values())
+        p50, p95, p99 = histogram_percentiles(histogram, (0.50, 0.95, 0.99))
+        return {
+            "policy": self.scheduler.name,
+            "quantum_ticks": self.scheduler.quantum_ticks,
+            "context_switches": self.context_switches,
+            "dispatches": samples,
+            "mean_latency": sum(k * v for k, v in histogram.items()) / samples if samples else 0.0,
+            "p50_latency": p50,
+            "p95_latency": p95,
+            "p99_latency": p99,
+            "max_latency": max(histogram, default=0),
+        }
+    
+    def show_scheduler_stats(self):
+        stats = self.scheduler_stats()
+        print("\nScheduler Statistics:")
+        print("-" * 40)
+        print(f"Policy: {stats['policy']}")
+        print(f"Quantum: {stats['quantum_ticks']} ticks")
+        print(f"Ticks: {self.system_ticks}")
+        print(f"Context switches: {stats['context_switches']}")
+        print(f"Mean latency: {stats['mean_latency']:.2f} ticks")
+        print(f"Latency p50/p95/p99: {stats['p50_latency']}/{stats['p95_latency']}/{stats['p99_latency']} ticks")
+        print(f"Max latency: {stats['max_latency']} ticks")
+        print()
+    
+    def process_scheduler_stats(self, process):
+        """Per-process counterpart of scheduler_stats(): CPU, wait time and latency"""
+        waiting = self.system_ticks - process.ready_since if process.state is ProcessState.READY else 0
+        return {
+            "pid": process.pid,
+            "name": process.name,
+            "priority": process.priority,
+            "state": process.state.value,
+            "run_ticks": process.run_ticks,
+            "dispatches": process.dispatches,
+            "wait_ticks": process.wait_ticks,
+            "waiting_now": waiting,
+            "mean_latency": process.wait_ticks / process.dispatches if process.dispatches else 0.0,
+            "max_latency": process.max_latency,
+        }
+    
+    def show_process_scheduler_stats(self, pid=None):
+        """One process in detail, or a table of every live process when pid is None"""
+        if pid is not None:
+            process = self.process_table.get(pid)
+            if process is None:
+                print(f"No such process: {pid}")
                 return
+            stats = self.process_scheduler_stats(process)
+            print(f"\nScheduler Statistics for PID {pid} ({stats['name']}):")
+            print("-" * 40)
+            print(f"State: {stats['state']}  Priority: {stats['priority']}")
+            print(f"CPU: {stats['run_ticks']} ticks over {stats['dispatches']} dispatches")
+            print(f"Waited: {stats['wait_ticks']} ticks (now waiting {stats['waiting_now']})")
+            print(f"Mean latency: {stats['mean_latency']:.2f} ticks")
+            print(f"Max latency: {stats['max_latency']} ticks")
+            print()
+            return
+        lines = ["", "PID\tName\t\t\tRun\tDisp\tWait\tMean\tMax", "-" * 64]
+        for process in self.process_table.live():
+            stats = self.process_scheduler_stats(process)
+            lines.append(f"{process.row_prefix}{stats['run_ticks']}\t{stats['dispatches']}\t"
+                         f"{stats['wait_ticks']}\t{stats['mean_latency']:.1f}\t{stats['max_latency']}")
+        lines.append("")
+        self.output.write_lines(lines)
     
     def list_processes(self):
-        print("\nRunning Processes:")
-        print("-" * 50)
-        print("PID\tName\t\t\tState\tPriority")
-        print("-" * 50)
-        for p in self.process_table:
-            if p.state != ProcessState.TERMINATED:
-                print(p)
-        print()
+        lines = ["", "Running Processes:", "-" * 50, "PID\tName\t\t\tState\tPriority", "-" * 50]
+        labels = STATE_LABELS
+        lines.extend([f"{p.row_prefix}{labels[p._state]}\t{p.priority}" for p in self.process_table.live()])
+        lines.append("")
+        self.output.write_lines(lines)
     
     def show_memory_info(self):
         free_kb = self.memory_total_kb - self.memory_allocated_kb
@@ -97,40 +2307,179 @@ class OSSimulator:
         print(f"Kernel Space: 256 pages (1 MB)")
         print(f"Used: {self.memory_allocated_kb} KB")
         print(f"Free: {free_kb} KB")
-        print(f"Available Pages: {free_kb // 4}")
-        print(f"Page Size: 4096 bytes")
+        stats = self.memory.stats()
+        print(f"Available Pages: {stats['free_pages']}")
+        print(f"Allocator: {stats['allocator']}")
+        print(f"Largest Free Block: {stats['largest_free_block']} pages")
+        print(f"Fragmentation: {stats['fragmentation'] * 100:.1f}%")
+        print(f"Allocation Latency p50/p99: {stats['alloc_p50_ns']}/{stats['alloc_p99_ns']} ns")
+        print(f"Page Size: {PAGE_SIZE} bytes")
+        cache = self.buffer_cache.stats()
+        print(f"Buffer Cache: {cache['cached']}/{cache['capacity']} blocks ({cache['dirty']} dirty)")
         print()
     
-    def list_directory(self, path="/"):
-        print(f"\nDirectory: {path}")
+    def show_cache_info(self):
+        stats = self.buffer_cache.stats()
+        print("\nBuffer Cache:")
         print("-" * 40)
-        print("Files:")
-        print("  .")
-        print("  ..")
-        
-        for file_path in self.files:
-            if file_path != "/":
-                name = file_path.split("/")[-1]
-                file_info = self.files[file_path]
-                size = file_info["size"]
-                print(f"  {name:<20} {size} bytes")
+        print(f"Policy: {stats['policy']}")
+        print(f"Cached: {stats['cached']}/{stats['capacity']} blocks")
+        print(f"Dirty: {stats['dirty']} blocks")
+        print(f"Hits: {stats['hits']}")
+        print(f"Misses: {stats['misses']}")
+        print(f"Hit Rate: {stats['hit_rate'] * 100:.1f}%")
+        print(f"Evictions: {stats['evictions']}")
+        print(f"Write-backs: {stats['writebacks']}")
+        print(f"Read-ahead: {stats['readahead_blocks']} blocks, {stats['readahead_hits']} used")
         print()
     
-    def create_file(self, filename):
-        path = self.current_directory.rstrip("/") + "/" + filename
-        if path not in self.files:
-            self.files[path] = {"type": "file", "size": 0}
-            print(f"Created file: {filename}")
+    @property
+    def files(self):
+        """Snapshot of the filesystem as {path: {"type", "size"}}"""
+        return {path: {"type": "directory" if inode.is_directory else "file", "size": inode.size}
+                for path, inode in self.fs.walk()}
+    
+    def list_directory(self, path="/"):
+        path = FileSystem.normalize(path, self.current_directory)
+        try:
+            entries = self.fs.list_directory(path)
+        except OSError:
+            print(f"No such directory: {path}")
+            return
+        lines = ["", f"Directory: {path}", "-" * 40, "Files:", "  .", "  .."]
+        lines.extend(f"  {name:<20} {inode.size} bytes" for name, inode in entries)
+        lines.append("")
+        self.output.write_lines(lines)
+    
+    def _create(self, name, file_type, kind):
+        path = FileSystem.normalize(name, self.current_directory)
+        try:
+            self.fs.create(path, file_type)
+        except FileExistsError:
+            if self.verbose:
+                print(f"{kind} already exists: {name}")
+        except FileSystemError as e:
+            if self.verbose:
+                print(f"Error: {e}")
         else:
-            print(f"File already exists: {filename}")
+            if self.verbose:
+                print(f"Created {kind.lower()}: {name}")
+    
+    def create_file(self, filename):
+        self._create(filename, FILE_TYPE_FILE, "File")
     
     def create_directory(self, dirname):
-        path = self.current_directory.rstrip("/") + "/" + dirname
-        if path not in self.files:
-            self.files[path] = {"type": "directory", "size": 0}
-            print(f"Created directory: {dirname}")
+        self._create(dirname, FILE_TYPE_DIRECTORY, "Directory")
+    
+    def delete_path(self, name):
+        path = FileSystem.normalize(name, self.current_directory)
+        try:
+            self.fs.delete(path)
+        except FileNotFoundError:
+            print(f"No such file or directory: {name}")
+        except FileSystemError as e:
+            print(f"Error: {e}")
+        else:
+            if self.verbose:
+                print(f"Removed: {name}")
+    
+    def _open(self, name, create=False):
+        path = FileSystem.normalize(name, self.current_directory)
+        inode = self.fs.resolve(path)
+        if inode is None and create:
+            inode = self.fs.create(path, FILE_TYPE_FILE)
+        if inode is None:
+            raise FileNotFoundError(name)
+        if inode.is_directory:
+            raise IsADirectoryError(name)
+        return inode
+    
+    def _host_path(self, name):
+        """Host path named by a host: prefix, or None for simulated files"""
+        if not name.startswith("host:"):
+            return None
+        if not self.host_files:
+            raise PermissionError(f"host: paths are not allowed here: {name}")
+        return name[5:]
+    
+    def read_file(self, name, chunk_size=STREAM_CHUNK):
+        """Generator over a file's contents; host:PATH reads a host file"""
+        host_path = self._host_path(name)
+        if host_path is not None:
+            return read_host_file(host_path, chunk_size)
+        return self.fs.read_chunks(self._open(name), chunk_size)
+    
+    def write_file(self, name, chunks, append=False):
+        """Stream chunks into a file, creating it if needed; host:PATH writes a host file"""
+        host_path = self._host_path(name)
+        if host_path is not None:
+            written = 0
+            with open(host_path, "ab" if append else "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+            return written
+        return self.fs.write_chunks(self._open(name, create=True), chunks, append)
+    
+    def _report_file_error(self, error, name):
+        if isinstance(error, FileNotFoundError):
+            print(f"No such file: {name}")
+        elif isinstance(error, IsADirectoryError):
+            print(f"Is a directory: {name}")
         else:
-            print(f"Directory already exists: {dirname}")
+            print(f"Error: {error}")
+    
+    def cat_file(self, name, out=None):
+        out = out or sys.stdout
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        try:
+            for chunk in self.read_file(name):
+                out.write(decoder.decode(chunk))
+        except (OSError, FileSystemError) as e:
+            self._report_file_error(e, name)
+        out.write(decoder.decode(b"", final=True))
+    
+    def write_text(self, name, text, append=False):
+        try:
+            self.write_file(name, [text.encode()], append)
+        except (OSError, FileSystemError) as e:
+            self._report_file_error(e, name)
+    
+    def copy_file(self, source, destination):
+        if not destination.startswith("host:"):
+            path = FileSystem.normalize(destination, self.current_directory)
+            target = self.fs.resolve(path)
+            if target is not None and target.is_directory:
+                destination = path.rstrip("/") + "/" + source.rpartition("/")[2].rpartition(":")[2]
+            if not source.startswith("host:") and (FileSystem.normalize(source, self.current_directory)
+                                                   == FileSystem.normalize(destination, self.current_directory)):
+                print(f"'{source}' and '{destination}' are the same file")
+                return
+        start = time.perf_counter()
+        try:
+            written = self.write_file(destination, self.read_file(source))
+        except (OSError, FileSystemError) as e:
+            self._report_file_error(e, source if isinstance(e, FileNotFoundError) else destination)
+            return
+        if self.verbose:
+            print(f"Copied {written} bytes in {time.perf_counter() - start:.2f}s")
+    
+    def change_directory(self, name):
+        path = FileSystem.normalize(name or "/", self.current_directory)
+        inode = self.fs.resolve(path)
+        if inode is None or not inode.is_directory:
+            print(f"No such directory: {name}")
+            return
+        self.current_directory = path
+    
+    def sync(self):
+        flushed = self.fs.sync()
+        if self.verbose:
+            print(f"Synced filesystem: {flushed} blocks written")
+    
+    def shutdown(self):
+        if self.initialized("fs"):
+            self.fs.close()
     
     def get_uptime(self):
         elapsed = time.time() - self.start_time
@@ -141,160 +2490,1232 @@ class OSSimulator:
     
     def show_uptime(self):
         h, m, s = self.get_uptime()
-        print(f"System uptime: {h} hours, {m} minutes, {s} seconds\n")
+        print(f"System uptime: {h} hours, {m} minutes, {s} seconds")
+        if self.startup_seconds is not None:
+            print(f"Startup time: {self.startup_seconds * 1000:.1f} ms")
+        print()
     
     def show_help(self):
-        print("\nAvailable Commands:")
-        print("-" * 50)
-        commands = [
-            ("help", "Display available commands"),
-            ("ps", "List running processes"),
-            ("exec <name>", "Execute new process"),
-            ("ls", "List directory contents"),
-            ("mkdir <name>", "Create directory"),
-            ("touch <name>", "Create file"),
-            ("pwd", "Print working directory"),
-            ("echo <text>", "Output text"),
-            ("meminfo", "Display memory information"),
-            ("uptime", "Display system uptime"),
-            ("clear", "Clear screen"),
-            ("exit", "Exit shell"),
-        ]
-        for cmd, desc in commands:
-            print(f"  {cmd:<20} - {desc}")
-        print()
+        lines = ["", "Available Commands:", "-" * 50]
+        lines.extend(f"  {entry.usage:<20} - {entry.description}" for entry in COMMANDS.values())
+        lines.append("")
+        self.output.write_lines(lines)
+
+class Job:
+    """Workload entry: arrives at a tick and alternates CPU and I/O bursts
+    
+    bursts is [cpu, io, cpu, io, ..., cpu] in ticks.
+    """
+    
+    def __init__(self, name, arrival, bursts, priority=0, memory_kb=0, file_ops=()):
+        self.name = name
+        self.arrival = arrival
+        self.bursts = bursts
+        self.priority = priority
+        self.memory_kb = memory_kb
+        self.file_ops = file_ops
+    
+    def to_dict(self):
+        record = {"name": self.name, "arrival": self.arrival, "bursts": list(self.bursts)}
+        if self.priority:
+            record["priority"] = self.priority
+        if self.memory_kb:
+            record["memory_kb"] = self.memory_kb
+        if self.file_ops:
+            record["file_ops"] = [list(op) for op in self.file_ops]
+        return record
+    
+    @classmethod
+    def from_dict(cls, record):
+        return cls(record["name"], record["arrival"], record["bursts"],
+                   record.get("priority", 0), record.get("memory_kb", 0),
+                   [tuple(op) for op in record.get("file_ops", ())])
+
+TRACE_MAGIC = b"OSTRACE1"
+TRACE_RECORD = struct.Struct("<QHIHBB")
+TRACE_FILE_OPS = ("touch", "mkdir")
+
+def write_trace(path, jobs):
+    """Stream jobs to a .jsonl trace, or the packed binary form otherwise
+    
+    Binary records are a fixed header (arrival, priority, memory_kb,
+    burst count, name length, file-op count) followed by uint32 bursts,
+    the UTF-8 name and (opcode, length, path) file ops.
+    """
+    count = 0
+    if path.endswith(".jsonl"):
+        with open(path, "w") as f:
+            for job in jobs:
+                f.write(json.dumps(job.to_dict(), separators=(",", ":")) + "\n")
+                count += 1
+        return count
+    with open(path, "wb") as f:
+        f.write(TRACE_MAGIC)
+        for job in jobs:
+            f.write(pack_trace_record(job))
+            count += 1
+    return count
+
+def pack_trace_record(job):
+    """A job's binary trace record, checked against the field widths first
+    
+    Raises ValueError for a job the format cannot hold, before any of its
+    bytes reach the trace, so a failed write never leaves a partial record.
+    """
+    name = job.name.encode()
+    if len(name) > 0xFF or len(job.file_ops) > 0xFF:
+        raise ValueError(f"Job {job.name[:32]!r} has a {len(name)}-byte name and {len(job.file_ops)} "
+                         f"file ops; a binary trace holds at most 255 of each")
+    try:
+        parts = [TRACE_RECORD.pack(job.arrival, job.priority, job.memory_kb,
+                                   len(job.bursts), len(name), len(job.file_ops)),
+                 struct.pack(f"<{len(job.bursts)}I", *job.bursts), name]
+        for op, op_path in job.file_ops:
+            encoded = op_path.encode()
+            parts.append(struct.pack("<BH", TRACE_FILE_OPS.index(op), len(encoded)))
+            parts.append(encoded)
+    except struct.error as e:
+        raise ValueError(f"Job {job.name[:32]!r} does not fit a binary trace: {e}") from None
+    return b"".join(parts)
+
+def read_trace(path):
+    """Yield Jobs from a trace one record at a time, in constant memory"""
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield Job.from_dict(json.loads(line))
+            return
+        header_size = TRACE_RECORD.size
+        while True:
+            header = f.read(header_size)
+            if len(header) < header_size:
+                return
+            arrival, priority, memory_kb, n_bursts, name_len, n_ops = TRACE_RECORD.unpack(header)
+            bursts = list(struct.unpack(f"<{n_bursts}I", f.read(4 * n_bursts)))
+            name = f.read(name_len).decode()
+            file_ops = []
+            for _ in range(n_ops):
+                opcode, length = struct.unpack("<BH", f.read(3))
+                file_ops.append((TRACE_FILE_OPS[opcode], f.read(length).decode()))
+            yield Job(name, arrival, bursts, priority, memory_kb, file_ops)
+
+def poisson_workload(count, rate=0.05, mean_burst=5, pareto_alpha=1.5, io_bursts=2,
+                     mean_io=20, max_priority=255, memory_kb=(4, 4096), file_op_rate=0.0,
+                     seed=None):
+    """Synthetic jobs with Poisson arrivals and heavy-tailed CPU bursts
+    
+    rate is arrivals per tick. CPU bursts are Pareto(pareto_alpha) scaled
+    to mean_burst; I/O waits are exponential around mean_io.
+    """
+    rng = random.Random(seed)
+    scale = mean_burst * (pareto_alpha - 1) / pareto_alpha if pareto_alpha > 1 else mean_burst
+    arrival = 0.0
+    for i in range(count):
+        arrival += rng.expovariate(rate)
+        bursts = []
+        for b in range(io_bursts + 1):
+            if b:
+                bursts.append(max(1, int(rng.expovariate(1 / mean_io))))
+            bursts.append(max(1, int(scale * rng.paretovariate(pareto_alpha))))
+        file_ops = []
+        if file_op_rate and rng.random() < file_op_rate:
+            file_ops.append(("touch", f"job{i}.dat"))
+        yield Job(f"job{i}", int(arrival), bursts, rng.randint(0, max_priority),
+                  rng.randint(*memory_kb), file_ops)
+
+class EventEngine:
+    """Headless discrete-event driver for OSSimulator
+    
+    Arrivals and I/O completions live in a heap-ordered event calendar.
+    Timer interrupts fire once per tick only while a process is on the
+    CPU; idle stretches are skipped by jumping the clock to the next
+    event, so virtual time is independent of wall-clock time. Jobs are
+    pulled lazily from an iterable sorted by arrival.
+    """
+    
+    ARRIVAL = "arrival"
+    IO_COMPLETE = "io_complete"
+    TIMER = "timer"
+    BURST_END = "burst_end"
+    
+    def __init__(self, simulator=None, scheduler="rr"):
+        if simulator is None:
+            simulator = OSSimulator(max_processes=1 << 30, scheduler=scheduler, verbose=False)
+        self.sim = simulator
+        self.calendar = []
+        self.seq = 0
+        self.event_counts = Counter()
+        self.jobs = iter(())
+        self.arrived = 0
+        self.rejected = 0
+        self.completed = 0
+        self.total_turnaround = 0
+        self.total_wait = 0
+        self.arrival_ticks = {}
+        self.wall_seconds = 0.0
+        self.fragmentation_samples = []
+        self.fragmentation_every = 1000
+    
+    def post(self, when, kind, payload):
+        self.seq += 1
+        heapq.heappush(self.calendar, (when, self.seq, kind, payload))
+    
+    def _pull_job(self):
+        job = next(self.jobs, None)
+        if job is not None:
+            self.post(job.arrival, self.ARRIVAL, job)
+    
+    def _arrive(self, job):
+        self._pull_job()
+        sim = self.sim
+        process = sim.create_process(job.name, job.priority)
+        if process is None:
+            self.rejected += 1
+            return
+        if job.memory_kb and not sim.allocate_memory(process, job.memory_kb):
+            self.rejected += 1
+            sim.terminate_process(process, reap=True)
+            return
+        self.arrived += 1
+        if self.arrived % self.fragmentation_every == 0:
+            self.fragmentation_samples.append(sim.memory.fragmentation())
+        for op, path in job.file_ops:
+            if op == "mkdir":
+                sim.create_directory(path)
+            else:
+                sim.create_file(path)
+        process.bursts = deque(job.bursts)
+        process.burst_remaining = process.bursts.popleft() if process.bursts else 0
+        self.arrival_ticks[process.pid] = sim.system_ticks
+        if process.burst_remaining <= 0:
+            self._end_burst(process)
+    
+    def _end_burst(self, process):
+        sim = self.sim
+        self.event_counts[self.BURST_END] += 1
+        if process.bursts:
+            io_ticks = process.bursts.popleft()
+            process.burst_remaining = process.bursts.popleft() if process.bursts else 0
+            sim.block_process(process)
+            self.post(sim.system_ticks + io_ticks, self.IO_COMPLETE, process)
+            return
+        turnaround = sim.system_ticks - self.arrival_ticks.pop(process.pid)
+        self.completed += 1
+        self.total_turnaround += turnaround
+        self.total_wait += process.wait_ticks
+        sim.terminate_process(process, reap=True)
+    
+    def _io_complete(self, process):
+        if process.burst_remaining <= 0:
+            self._end_burst(process)
+        else:
+            self.sim.wake_process(process)
+    
+    def run(self, jobs=(), until=None, max_events=None):
+        """Process events until the calendar drains or a limit is hit"""
+        sim = self.sim
+        idle = sim.idle_process
+        calendar = self.calendar
+        counts = self.event_counts
+        handlers = {self.ARRIVAL: self._arrive, self.IO_COMPLETE: self._io_complete}
+        self.jobs = iter(jobs)
+        self._pull_job()
+        processed = 0
+        start = time.perf_counter()
+        while max_events is None or processed < max_events:
+            now = sim.system_ticks
+            if until is not None and now >= until:
+                break
+            busy = sim.current_process is not idle
+            if calendar and (calendar[0][0] <= now or not busy):
+                when, _, kind, payload = heapq.heappop(calendar)
+                if when > now:
+                    idle.run_ticks += when - now
+                    sim.system_ticks = when
+                handlers[kind](payload)
+                counts[kind] += 1
+                if sim.current_process is idle:
+                    sim.schedule()
+            elif busy:
+                process = sim.current_process
+                sim.tick()
+                counts[self.TIMER] += 1
+                process.burst_remaining -= 1
+                if process.burst_remaining <= 0:
+                    self._end_burst(process)
+            else:
+                break
+            processed += 1
+        self.wall_seconds += time.perf_counter() - start
+        return self.report()
+    
+    def report(self):
+        events = sum(self.event_counts.values())
+        report = {
+            "virtual_ticks": self.sim.system_ticks,
+            "events": events,
+            "wall_seconds": self.wall_seconds,
+            "events_per_second": events / self.wall_seconds if self.wall_seconds else 0.0,
+            "arrived": self.arrived,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "mean_turnaround": self.total_turnaround / self.completed if self.completed else 0.0,
+            "mean_wait": self.total_wait / self.completed if self.completed else 0.0,
+        }
+        report.update(self.sim.scheduler_stats())
+        report.update(self.sim.memory.stats())
+        samples = self.fragmentation_samples
+        report["mean_fragmentation"] = sum(samples) / len(samples) if samples else 0.0
+        report["max_fragmentation"] = max(samples, default=0.0)
+        return report
+
+class BatchSimulator:
+    """Run many independent CPU-bound simulations in lock-step with NumPy
+    
+    Each row of bursts is one simulation whose processes all arrive at
+    tick 0 with a single CPU burst (0 marks an empty slot). Process state
+    lives in (simulations, processes) arrays and every tick advances all
+    rows at once. Supports the 'rr' and 'cfs' policies with a per-row
+    quantum; verify() replays rows through EventEngine to check that the
+    results match the scalar simulator exactly.
+    """
+    
+    READY, RUNNING, TERMINATED = 0, 1, 2
+    UNQUEUED = 2 ** 62
+    
+    def __init__(self, bursts, priorities=None, quantum_ticks=1, policy="rr"):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("BatchSimulator requires numpy")
+        if policy not in ("rr", "cfs"):
+            raise ValueError(f"unsupported batch policy: {policy}")
+        load_numpy()
+        self.policy = policy
+        self.bursts = np.array(bursts, dtype=np.int64)
+        n, p = self.bursts.shape
+        if priorities is None:
+            priorities = np.zeros((n, p), dtype=np.int64)
+        self.priorities = np.clip(np.array(priorities, dtype=np.int64), 0, 255)
+        self.quantum = np.broadcast_to(np.maximum(np.asarray(quantum_ticks, dtype=np.int64), 1), (n,)).copy()
+        increments = np.array([1024 / priority_weight(level) for level in range(256)])
+        self.vruntime_step = increments[self.priorities]
+        present = self.bursts > 0
+        
+        self.remaining = self.bursts.copy()
+        self.state = np.where(present, self.READY, self.TERMINATED).astype(np.int8)
+        self.order = np.where(present, np.arange(p, dtype=np.int64), self.UNQUEUED)
+        self.next_seq = np.full(n, p, dtype=np.int64)
+        self.vruntime = np.zeros((n, p))
+        self.min_vruntime = np.zeros(n)
+        self.ready_since = np.zeros((n, p), dtype=np.int64)
+        self.completion = np.full((n, p), -1, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.slice = np.zeros(n, dtype=np.int64)
+        self.switches = np.zeros(n, dtype=np.int64)
+        self.dispatches = np.zeros(n, dtype=np.int64)
+        self.latency_sum = np.zeros(n, dtype=np.int64)
+        self.max_latency = np.zeros(n, dtype=np.int64)
+        
+        self.current = np.where(present.any(axis=1), present.argmax(axis=1), -1)
+        rows = np.flatnonzero(self.current >= 0)
+        self.state[rows, self.current[rows]] = self.RUNNING
+        self.order[rows, self.current[rows]] = self.UNQUEUED
+        self.switches[rows] = 1
+        self.dispatches[rows] = 1
+    
+    def _pick(self, rows):
+        """Best READY slot per row; returns (found, slot, its vruntime)"""
+        order = self.order[rows]
+        if self.policy == "cfs":
+            keys = np.where(order != self.UNQUEUED, self.vruntime[rows], np.inf)
+            lowest = keys.min(axis=1)
+            order[keys != lowest[:, None]] = self.UNQUEUED
+        else:
+            lowest = None
+        slot = order.argmin(axis=1)
+        found = order[np.arange(len(rows)), slot] != self.UNQUEUED
+        return found, slot, lowest
+    
+    def step(self):
+        """Advance every unfinished simulation by one timer tick"""
+        rows = np.flatnonzero(self.current >= 0)
+        if not len(rows):
+            return False
+        cur = self.current[rows]
+        self.ticks[rows] += 1
+        self.slice[rows] += 1
+        if self.policy == "cfs":
+            self.vruntime[rows, cur] += self.vruntime_step[rows, cur]
+            # Same as FairScheduler.tick: follow min(running, leftmost queued)
+            queued = np.where(self.order[rows] != self.UNQUEUED, self.vruntime[rows], np.inf).min(axis=1)
+            self.min_vruntime[rows] = np.maximum(self.min_vruntime[rows],
+                                                 np.minimum(self.vruntime[rows, cur], queued))
+        self.remaining[rows, cur] -= 1
+        finished = self.remaining[rows, cur] == 0
+        expired = self.slice[rows] >= self.quantum[rows]
+        
+        called = expired | finished
+        rows, cur, finished = rows[called], cur[called], finished[called]
+        if not len(rows):
+            return True
+        found, slot, lowest = self._pick(rows)
+        if self.policy == "cfs":
+            switch = (found & (lowest < self.vruntime[rows, cur])) | finished
+            self.slice[rows[switch]] = 0
+        else:
+            switch = found | finished
+            self.slice[rows] = 0
+        
+        rows, cur, slot, found, finished = rows[switch], cur[switch], slot[switch], found[switch], finished[switch]
+        
+        done_rows, done_cur = rows[finished], cur[finished]
+        self.state[done_rows, done_cur] = self.TERMINATED
+        self.completion[done_rows, done_cur] = self.ticks[done_rows]
+        
+        to_rows, to_slot = rows[found], slot[found]
+        if self.policy == "cfs":
+            self.min_vruntime[to_rows] = np.maximum(self.min_vruntime[to_rows], self.vruntime[to_rows, to_slot])
+        back = ~finished
+        back_rows, back_cur = rows[back], cur[back]
+        self.state[back_rows, back_cur] = self.READY
+        self.order[back_rows, back_cur] = self.next_seq[back_rows]
+        self.next_seq[back_rows] += 1
+        self.ready_since[back_rows, back_cur] = self.ticks[back_rows]
+        if self.policy == "cfs":
+            self.vruntime[back_rows, back_cur] = np.maximum(self.vruntime[back_rows, back_cur],
+                                                            self.min_vruntime[back_rows])
+        
+        self.state[to_rows, to_slot] = self.RUNNING
+        self.order[to_rows, to_slot] = self.UNQUEUED
+        latency = self.ticks[to_rows] - self.ready_since[to_rows, to_slot]
+        self.latency_sum[to_rows] += latency
+        self.max_latency[to_rows] = np.maximum(self.max_latency[to_rows], latency)
+        self.dispatches[to_rows] += 1
+        self.switches[rows] += 1
+        self.current[rows] = np.where(found, slot, -1)
+        return True
+    
+    def run(self, max_ticks=None):
+        steps = 0
+        while (max_ticks is None or steps < max_ticks) and self.step():
+            steps += 1
+        return self.results()
+    
+    def results(self):
+        """One summary dict per simulation, in the same shape as result_for_engine()"""
+        present = self.bursts > 0
+        counts = present.sum(axis=1)
+        turnaround = np.where(present, self.completion, 0).sum(axis=1)
+        results = []
+        for i in range(len(self.bursts)):
+            results.append({
+                "virtual_ticks": int(self.ticks[i]),
+                "completed": int((self.completion[i] >= 0).sum()),
+                "mean_turnaround": float(turnaround[i] / counts[i]) if counts[i] else 0.0,
+                "context_switches": int(self.switches[i]),
+                "mean_latency": float(self.latency_sum[i] / self.dispatches[i]) if self.dispatches[i] else 0.0,
+                "max_latency": int(self.max_latency[i]),
+            })
+        return results
+    
+    def reference(self, index):
+        """Replay one row through the scalar EventEngine"""
+        scheduler = SCHEDULERS[self.policy](quantum_ticks=int(self.quantum[index]))
+        engine = EventEngine(OSSimulator(max_processes=1 << 30, scheduler=scheduler, verbose=False))
+        jobs = [Job(f"p{slot}", 0, [int(burst)], int(self.priorities[index, slot]))
+                for slot, burst in enumerate(self.bursts[index]) if burst > 0]
+        return result_for_engine(engine.run(jobs))
+    
+    def verify(self, indices=None):
+        """Return (row, field, batch, scalar) for every mismatch against the reference"""
+        results = self.results()
+        if indices is None:
+            indices = range(len(results))
+        mismatches = []
+        for i in indices:
+            expected = self.reference(i)
+            for key, value in expected.items():
+                if results[i][key] != value:
+                    mismatches.append((i, key, results[i][key], value))
+        return mismatches
+
+def result_for_engine(report):
+    """Project an EventEngine report onto the BatchSimulator result fields"""
+    return {
+        "virtual_ticks": report["virtual_ticks"],
+        "completed": report["completed"],
+        "mean_turnaround": report["mean_turnaround"],
+        "context_switches": report["context_switches"],
+        "mean_latency": report["mean_latency"],
+        "max_latency": report["max_latency"],
+    }
+
+SWEEP_WORKLOAD_KEYS = ("rate", "mean_burst", "pareto_alpha", "io_bursts", "mean_io", "max_priority")
+SWEEP_SEED_KEYS = SWEEP_WORKLOAD_KEYS + ("jobs",)
+
+def sweep_points(grid, repeats=1, base_seed=0):
+    """Expand {param: [values]} into run dicts, each with a stable seed
+    
+    The seed is derived from the workload parameters and repeat index only,
+    so points that differ just in scheduler or allocator settings replay the
+    same job stream (common random numbers), whatever the grid order or worker.
+    """
+    keys = sorted(grid)
+    for values in itertools.product(*(grid[key] for key in keys)):
+        point = dict(zip(keys, values))
+        workload = {key: point[key] for key in SWEEP_SEED_KEYS if key in point}
+        for repeat in range(repeats):
+            tag = json.dumps([workload, repeat, base_seed], sort_keys=True)
+            yield dict(point, repeat=repeat, seed=zlib.crc32(tag.encode()))
+
+def run_sweep_point(params):
+    """Run one EventEngine simulation described by a sweep point"""
+    scheduler = SCHEDULERS[params.get("scheduler", "rr")].from_config(load_config())
+    if "quantum_ticks" in params:
+        scheduler.quantum_ticks = max(1, params["quantum_ticks"])
+    if "aging_ticks" in params and hasattr(scheduler, "aging_ticks"):
+        scheduler.aging_ticks = params["aging_ticks"]
+    if "aging_step" in params and hasattr(scheduler, "aging_step"):
+        scheduler.aging_step = params["aging_step"]
+    physical_pages = params["memory_total_kb"] // 4 if "memory_total_kb" in params else None
+    sim = OSSimulator(max_processes=params.get("max_processes", 1 << 30), scheduler=scheduler,
+                      verbose=False, physical_pages=physical_pages,
+                      allocator=params.get("allocator", "first-fit"))
+    workload = {key: params[key] for key in SWEEP_WORKLOAD_KEYS if key in params}
+    jobs = poisson_workload(params.get("jobs", 10000), seed=params["seed"], **workload)
+    report = EventEngine(sim).run(jobs, until=params.get("until"))
+    return dict(params, **report)
+
+def run_sweep(grid, workers=None, out=None, repeats=1, base_seed=0):
+    """Fan sweep points out over a process pool, streaming rows as they finish
+    
+    Rows are yielded in completion order and, when out is given, appended
+    to a CSV file as they arrive so partial sweeps are never lost.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    points = list(sweep_points(grid, repeats, base_seed))
+    writer = None
+    handle = open(out, "w", newline="") if out else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_sweep_point, point) for point in points]
+            for future in as_completed(futures):
+                row = future.result()
+                if handle:
+                    if writer is None:
+                        writer = csv.DictWriter(handle, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+                    handle.flush()
+                yield row
+    finally:
+        if handle:
+            handle.close()
 
 def clear_screen():
     os.system('clear' if os.name == 'posix' else 'cls')
 
-def boot_sequence():
-    """Display boot sequence"""
-    clear_screen()
+def boot_sequence(fast=False):
+    """Display boot sequence; fast skips the screen clear and the cosmetic delays"""
+    pause = (lambda seconds: None) if fast else time.sleep
+    if not fast:
+        clear_screen()
     print("=" * 60)
     print("Operating System OS - Bootloader")
     print("=" * 60)
     print()
     print("Starting bootloader...")
-    time.sleep(0.5)
+    pause(0.5)
     print("✓ BIOS initialization complete")
-    time.sleep(0.3)
+    pause(0.3)
     print("✓ Loading kernel from disk")
-    time.sleep(0.3)
+    pause(0.3)
     print("✓ Switching to 32-bit protected mode")
-    time.sleep(0.3)
+    pause(0.3)
     print("✓ Kernel loaded at 0x1000")
     print()
     print("=" * 60)
     print("Operating System OS - Kernel Initialization")
     print("=" * 60)
     print()
-    time.sleep(0.3)
+    pause(0.3)
     print("Initializing kernel subsystems...")
-    time.sleep(0.2)
+    pause(0.2)
     print("✓ Interrupts initialized")
-    time.sleep(0.2)
+    pause(0.2)
     print("✓ Memory management initialized")
     print("  - Total memory: 256 MB")
     print("  - Page size: 4 KB")
     print("  - Kernel reserved: 1 MB (256 pages)")
-    time.sleep(0.2)
+    pause(0.2)
     print("✓ File system initialized")
     print("  - Max files: 512")
     print("  - Max blocks: 8192")
     print("  - Block size: 4 KB")
-    time.sleep(0.2)
+    pause(0.2)
     print("✓ Idle process created (PID=1)")
     print()
-    time.sleep(0.5)
+    pause(0.5)
+
+class Pager:
+    """less-style viewport over a list of lines
+    
+    space/f next page, b previous page, Enter/j/Down next line, k/Up
+    previous line, g/G top/bottom, /text search, n next match, q quit.
+    Each screen is drawn with a single write.
+    """
+    
+    def __init__(self, lines, stream, height):
+        self.lines = lines
+        self.stream = stream
+        self.page = max(1, height - 1)
+        self.top = 0
+        self.pattern = ""
+    
+    def run(self):
+        last = max(0, len(self.lines) - self.page)
+        with cbreak(sys.stdin):
+            while True:
+                self.top = min(max(self.top, 0), last)
+                self.draw(self.top >= last)
+                key = read_key(sys.stdin)
+                if key in ("q", "Q", "", "\x03"):
+                    break
+                elif key in (" ", "f", "\x1b[6~"):
+                    self.top += self.page
+                elif key in ("b", "\x1b[5~"):
+                    self.top -= self.page
+                elif key in ("\n", "\r", "j", "\x1b[B"):
+                    self.top += 1
+                elif key in ("k", "\x1b[A"):
+                    self.top -= 1
+                elif key == "g":
+                    self.top = 0
+                elif key == "G":
+                    self.top = last
+                elif key == "/":
+                    self.pattern = read_line(sys.stdin, self.stream, "/") or self.pattern
+                    self.search(self.top)
+                elif key == "n" and self.pattern:
+                    self.search(self.top + 1)
+        self.stream.write("\r\x1b[K")
+        self.stream.flush()
+    
+    def search(self, start):
+        for index in range(start, len(self.lines)):
+            if self.pattern in self.lines[index]:
+                self.top = index
+                return
+    
+    def draw(self, at_end):
+        shown = self.lines[self.top:self.top + self.page]
+        status = "(END)" if at_end else f":{self.top + 1}-{self.top + len(shown)}/{len(self.lines)}"
+        self.stream.write("\x1b[H\x1b[2J" + "\n".join(shown) + "\n" + f"\x1b[7m{status}\x1b[0m")
+        self.stream.flush()
+
+class cbreak:
+    """Put a terminal into unbuffered, no-echo mode for the duration of a with block"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.saved = None
+    
+    def __enter__(self):
+        if termios is not None and self.stream.isatty():
+            self.saved = termios.tcgetattr(self.stream)
+            tty.setcbreak(self.stream)
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.saved is not None:
+            termios.tcsetattr(self.stream, termios.TCSADRAIN, self.saved)
+
+def read_key(stream):
+    """One keypress, with escape sequences such as arrows returned whole"""
+    if termios is None or not stream.isatty():
+        return stream.readline()[:1] or "q"
+    fd = stream.fileno()
+    key = os.read(fd, 1).decode(errors="replace")
+    if key == "\x1b":
+        key += os.read(fd, 2).decode(errors="replace")
+        if key[-1].isdigit():
+            key += os.read(fd, 1).decode(errors="replace")
+    return key
+
+def read_line(stream, echo, prompt):
+    """Read a line in cbreak mode, echoing it after prompt on the status line"""
+    echo.write(f"\r\x1b[K{prompt}")
+    echo.flush()
+    text = ""
+    while True:
+        key = read_key(stream)
+        if key in ("\n", "\r", ""):
+            return text
+        if key == "\x1b":
+            return ""
+        if key in ("\x7f", "\b"):
+            text = text[:-1]
+        elif key.isprintable():
+            text += key
+        echo.write(f"\r\x1b[K{prompt}{text}")
+        echo.flush()
+
+class ShellOutput:
+    """Where a command's formatted rows go: one write per listing
+    
+    With paging on and a listing taller than the terminal, the rows are
+    shown through Pager instead. stream None means the current sys.stdout.
+    """
+    
+    def __init__(self, stream=None, paging=False):
+        self.stream = stream
+        self.paging = paging
+    
+    def write_lines(self, lines):
+        stream = self.stream or sys.stdout
+        if self.paging:
+            height = shutil.get_terminal_size().lines
+            if len(lines) >= height:
+                stream.flush()
+                Pager(lines, stream, height).run()
+                return
+        stream.write("\n".join(lines) + "\n")
+
+class ShellCommand:
+    """Command table entry, as ShellCommand in shell/shell.c"""
+    
+    __slots__ = ("name", "handler", "usage", "description")
+    
+    def __init__(self, name, handler, usage, description):
+        self.name = name
+        self.handler = handler
+        self.usage = usage
+        self.description = description
+
+COMMANDS = {}
+
+def command(name, description, usage=None):
+    """Register handler(shell, arg) under name; plugins extend the shell this way
+    
+    A handler returns True to end the session. Registering an existing
+    name replaces that command.
+    """
+    def register(handler):
+        COMMANDS[name] = ShellCommand(name, handler, usage or name, description)
+        return handler
+    return register
+
+def load_plugin(plugin):
+    """Import a plugin given as a module name (found from the cwd) or a .py path"""
+    if plugin.endswith(".py"):
+        name = os.path.splitext(os.path.basename(plugin))[0]
+        spec = importlib.util.spec_from_file_location(name, plugin)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    return importlib.import_module(plugin)
+
+class Shell:
+    """One command session over an OSSimulator
+    
+    interactive sessions prompt with input(); batch sessions read lines
+    from a script or pipe, print no banner or prompt, and never clear the
+    screen. remote sessions (ShellServer connections) share the simulator
+    with other sessions: they keep their own current_directory, and exit
+    ends only the session.
+    """
+    
+    def __init__(self, simulator, interactive=True, remote=False):
+        self.simulator = simulator
+        self.interactive = interactive
+        self.remote = remote
+        self.current_directory = "/"
+        self.history = []
+        self.unknown_commands = 0
+        if not remote:
+            simulator.output.paging = interactive and sys.stdin.isatty() and sys.stdout.isatty()
+    
+    def execute(self, line):
+        """Run one command line; returns False once the session should end"""
+        parts = line.split(maxsplit=1)
+        if not parts:
+            return True
+        self.history.append(line)
+        name = parts[0].lower()
+        entry = COMMANDS.get(name)
+        if entry is None:
+            self.unknown_commands += 1
+            print(f"Unknown command: {name}")
+            print("Type 'help' for available commands.")
+            print()
+            return True
+        return not entry.handler(self, parts[1] if len(parts) > 1 else "")
+    
+    def usage(self, name):
+        print(f"Usage: {COMMANDS[name].usage}")
+    
+    def prompt(self):
+        self.simulator.idle()
+        return input("> ")
+    
+    def run(self, lines=None):
+        """Execute lines (default: prompt with input()) until exit or EOF"""
+        if lines is None:
+            lines = iter(self.prompt, None)
+        while True:
+            try:
+                line = next(lines, None)
+                if line is None:
+                    raise EOFError
+                if not self.execute(line.strip()):
+                    return
+            except KeyboardInterrupt:
+                if not self.interactive:
+                    raise
+                print("\n\nInterrupt received. Type 'exit' to shutdown.")
+                print()
+            except EOFError:
+                if self.interactive:
+                    print("\nExiting shell...")
+                self.simulator.shutdown()
+                return
+
+@command("help", "Display available commands")
+def cmd_help(shell, arg):
+    shell.simulator.show_help()
+
+@command("ps", "List running processes")
+def cmd_ps(shell, arg):
+    shell.simulator.list_processes()
+
+@command("exec", "Execute new process", "exec <name>")
+def cmd_exec(shell, arg):
+    if not arg:
+        return shell.usage("exec")
+    process = shell.simulator.create_process(arg, priority=0)
+    if process:
+        shell.simulator.allocate_memory(process, DEFAULT_PROCESS_KB)
+
+@command("ls", "List directory contents", "ls [path]")
+def cmd_ls(shell, arg):
+    shell.simulator.list_directory(arg or shell.simulator.current_directory)
+
+@command("cd", "Change directory", "cd <path>")
+def cmd_cd(shell, arg):
+    shell.simulator.change_directory(arg)
+
+@command("mkdir", "Create directory", "mkdir <name>")
+def cmd_mkdir(shell, arg):
+    if not arg:
+        return shell.usage("mkdir")
+    shell.simulator.create_directory(arg)
+    print()
+
+@command("touch", "Create file", "touch <name>")
+def cmd_touch(shell, arg):
+    if not arg:
+        return shell.usage("touch")
+    shell.simulator.create_file(arg)
+    print()
+
+@command("cat", "Print file contents", "cat <file>")
+def cmd_cat(shell, arg):
+    if not arg:
+        return shell.usage("cat")
+    shell.simulator.cat_file(arg)
+    print()
+
+@command("write", "Write text to a file", "write <file> <text>")
+def cmd_write(shell, arg):
+    name, _, text = arg.partition(" ")
+    if not name:
+        return shell.usage("write")
+    shell.simulator.write_text(name, text + "\n")
+
+@command("cp", "Copy a file (host:PATH for host files)", "cp <src> <dst>")
+def cmd_cp(shell, arg):
+    names = arg.split()
+    if len(names) != 2:
+        return shell.usage("cp")
+    shell.simulator.copy_file(*names)
+    print()
+
+@command("rm", "Remove file or empty directory", "rm <name>")
+def cmd_rm(shell, arg):
+    if not arg:
+        return shell.usage("rm")
+    shell.simulator.delete_path(arg)
+    print()
+
+@command("sync", "Flush filesystem to disk")
+def cmd_sync(shell, arg):
+    shell.simulator.sync()
+    print()
+
+@command("pwd", "Print working directory")
+def cmd_pwd(shell, arg):
+    print(shell.simulator.current_directory)
+    print()
+
+@command("echo", "Output text (> or >> redirects to a file)", "echo <text>")
+def cmd_echo(shell, arg):
+    redirect = re.match(r"(.*?)\s*(>>?)\s*(\S+)$", arg)
+    if redirect:
+        text, operator, target = redirect.groups()
+        shell.simulator.write_text(target, text + "\n", append=operator == ">>")
+        return
+    if arg:
+        print(arg)
+    print()
+
+@command("meminfo", "Display memory information")
+def cmd_meminfo(shell, arg):
+    shell.simulator.show_memory_info()
+
+@command("sched", "Display scheduler statistics (per process with a PID or 'all')", "sched [pid|all]")
+def cmd_sched(shell, arg):
+    if not arg:
+        shell.simulator.show_scheduler_stats()
+    elif arg == "all":
+        shell.simulator.show_process_scheduler_stats()
+    elif arg.isdigit():
+        shell.simulator.show_process_scheduler_stats(int(arg))
+    else:
+        print("Usage: sched [pid|all]")
+
+@command("cacheinfo", "Display buffer cache statistics")
+def cmd_cacheinfo(shell, arg):
+    shell.simulator.show_cache_info()
+
+@command("uptime", "Display system uptime")
+def cmd_uptime(shell, arg):
+    shell.simulator.show_uptime()
+
+@command("clear", "Clear screen")
+def cmd_clear(shell, arg):
+    if shell.interactive:
+        clear_screen()
+
+@command("history", "Show this session's commands")
+def cmd_history(shell, arg):
+    shell.simulator.output.write_lines([f"{index:5}  {line}" for index, line in enumerate(shell.history, 1)])
+
+@command("exit", "Exit shell")
+def cmd_exit(shell, arg):
+    if shell.remote:
+        print("Session closed.")
+        return True
+    print("Exiting shell...")
+    print("Shutting down kernel...")
+    shell.simulator.shutdown()
+    print("System halted.")
+    return True
+
+def frame_response(text):
+    """Dot-stuff text and terminate it with a lone "." line, as SMTP does"""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return "".join(("." + line if line.startswith(".") else line) + "\n" for line in lines) + ".\n"
+
+class ShellServer:
+    """Serve the shell command set to many connections over one OSSimulator
+    
+    Each connection is a remote Shell session with its own working
+    directory and history. Commands run to completion on the event loop,
+    one at a time, so mutations of the shared kernel state are serialized
+    without locks. Every response is framed by frame_response(), which
+    lets clients pipeline requests.
+    """
+    
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.sessions = 0
+        self.commands = 0
+    
+    def run_command(self, shell, line):
+        """Execute line in shell's context; returns (output, session still open)"""
+        simulator = self.simulator
+        buffer = io.StringIO()
+        saved = simulator.current_directory, simulator.output, simulator.host_files
+        simulator.current_directory = shell.current_directory
+        simulator.output = ShellOutput(buffer)
+        simulator.host_files = not shell.remote
+        try:
+            with contextlib.redirect_stdout(buffer):
+                alive = shell.execute(line)
+        except (OSError, FileSystemError, ValueError) as e:
+            buffer.write(f"Error: {e}\n")
+            alive = True
+        finally:
+            shell.current_directory = simulator.current_directory
+            simulator.current_directory, simulator.output, simulator.host_files = saved
+        self.commands += 1
+        return buffer.getvalue(), alive
+    
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        shell = Shell(self.simulator, interactive=False, remote=True)
+        writer.write(frame_response("Operating System OS Shell v1.0").encode())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                output, alive = self.run_command(shell, line.decode(errors="replace").strip())
+                writer.write(frame_response(output).encode())
+                if not alive:
+                    break
+                if writer.transport.get_write_buffer_size() > STREAM_CHUNK:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+def serve(address, simulator):
+    """Run a ShellServer on unix:PATH or [HOST:]PORT until SIGINT or SIGTERM"""
+    import asyncio
+    import signal
+    
+    server = ShellServer(simulator)
+    
+    async def main():
+        if address.startswith("unix:"):
+            listener = await asyncio.start_unix_server(server.handle, address[5:])
+        else:
+            host, _, port = address.rpartition(":")
+            listener = await asyncio.start_server(server.handle, host or "127.0.0.1", int(port))
+        print(f"Listening on {address}", flush=True)
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(signum, lambda: stopped.done() or stopped.set_result(None))
+        journal = simulator.journal
+        committer = loop.create_task(commit_groups(journal.group_interval)) if journal else None
+        async with listener:
+            await stopped
+        if committer:
+            committer.cancel()
+    
+    async def commit_groups(interval):
+        """Bound how long an idle server leaves metadata uncommitted"""
+        while True:
+            await asyncio.sleep(interval)
+            simulator.idle()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if address.startswith("unix:") and os.path.exists(address[5:]):
+            os.unlink(address[5:])
+        simulator.shutdown()
+        print(f"Server stopped after {server.commands} commands")
+
+def replay(args):
+    if args.generate:
+        jobs = poisson_workload(args.generate, rate=args.rate, seed=args.seed)
+        if args.trace:
+            count = write_trace(args.trace, jobs)
+            print(f"Wrote {count} jobs to {args.trace}")
+            return
+    else:
+        jobs = read_trace(args.trace)
+    engine = EventEngine(OSSimulator(max_processes=1 << 30, scheduler=args.scheduler,
+                                     verbose=False, allocator=args.allocator))
+    report = engine.run(jobs, until=args.until)
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:.2f}"
+        print(f"{key:<24} {value}")
+
+def sweep(args):
+    with open(args.sweep) as f:
+        grid = json.load(f)
+    start = time.perf_counter()
+    runs = 0
+    for row in run_sweep(grid, workers=args.workers, out=args.out,
+                         repeats=args.repeats, base_seed=args.seed or 0):
+        runs += 1
+        print(f"[{runs}] {row.get('scheduler', 'rr'):<8} seed={row['seed']:<10} "
+              f"turnaround={row['mean_turnaround']:.1f} latency={row['mean_latency']:.1f}")
+    print(f"{runs} runs in {time.perf_counter() - start:.2f}s")
+
+def vm_study(args):
+    if args.vm_trace:
+        references = read_reference_trace(args.vm_trace)
+    else:
+        references = reference_workload(args.vm_generate, seed=args.seed)
+    vm = VirtualMemory(args.frames, args.vm_policy, args.tlb_entries)
+    start = time.perf_counter()
+    stats = vm.run(references)
+    stats["wall_seconds"] = time.perf_counter() - start
+    for key, value in stats.items():
+        if isinstance(value, float):
+            value = f"{value:.4f}"
+        print(f"{key:<24} {value}")
+
+def namespace(fs):
+    return {path: (inode.is_directory, inode.size) for path, inode in fs.walk()}
+
+def crash_test(args, total_blocks=2048, total_inodes=256, operations=300):
+    """Crash a journaled filesystem at random writes and check each recovery
+    
+    Every round runs random create/mkdir/rm/sync operations over volatile
+    doubles of the device and journal, crashes at a random write or
+    fsync, and remounts. The recovered filesystem must pass check() and
+    match the namespace as of the last commit that reached the journal.
+    """
+    rng = random.Random(args.seed)
+    failures = replayed = 0
+    for round_number in range(args.crash_test):
+        crash_point = CrashPoint(0)
+        device = VolatileBlockDevice(total_blocks, 4096, crash_point)
+        journal = VolatileJournal(crash_point, group_size=rng.choice((1, 4, 16, 64)))
+        fs = FileSystem(total_blocks, total_inodes, 4096, BufferCache(device, 32), journal)
+        fs.sync()
+        snapshots = {journal.sequence: namespace(fs)}
+        directories = ["/"]
+        crash_point.countdown = rng.randint(1, 600)
+        try:
+            for _ in range(operations):
+                name = rng.choice(directories).rstrip("/") + f"/n{rng.randrange(40)}"
+                roll = rng.random()
+                try:
+                    if roll < 0.5:
+                        fs.create_file(name, rng.randrange(20 * 4096))
+                    elif roll < 0.7:
+                        fs.create_directory(name)
+                        directories.append(name)
+                    elif roll < 0.98:
+                        fs.delete(name)
+                        if name in directories:
+                            directories.remove(name)
+                    else:
+                        fs.sync()
+                except (OSError, FileSystemError):
+                    pass
+                if journal.sequence not in snapshots:
+                    snapshots[journal.sequence] = namespace(fs)
+        except SimulatedCrash:
+            if journal.sequence not in snapshots:
+                snapshots[journal.sequence] = namespace(fs)
+        crash_point.countdown = 0
+        journal.crash(rng)
+        device.crash(rng)
+        try:
+            recovered = FileSystem(total_blocks, total_inodes, 4096, BufferCache(device, 32), journal)
+        except FileSystemError as e:
+            problems = [f"mount failed: {e}"]
+        else:
+            replayed += recovered.recovered
+            problems = recovered.check()
+        if not problems and namespace(recovered) != snapshots[journal.checkpointed]:
+            problems.append("namespace differs from the last durable commit")
+        if problems:
+            failures += 1
+            print(f"round {round_number}: " + "; ".join(problems))
+    print(f"{args.crash_test} crashes, {replayed} transactions replayed, {failures} inconsistent")
+    return failures
 
 def main():
-    boot_sequence()
+    started = time.perf_counter()
+    import argparse
+    parser = argparse.ArgumentParser(description="Operating System OS Simulator")
+    parser.add_argument("script", nargs="?", help="run shell commands from this file ('-' for stdin) and exit")
+    parser.add_argument("--batch", action="store_true",
+                        help="read commands from stdin without boot output (implied when stdin is not a TTY)")
+    parser.add_argument("--fast-boot", action="store_true",
+                        help=f"skip the cosmetic boot delays (or set {FAST_BOOT_ENV}=1)")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="serve the shell to many clients on unix:PATH or [HOST:]PORT")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULE",
+                        help="import MODULE (or a .py file) before starting; it can register commands with @command")
+    parser.add_argument("--replay", dest="trace", help="run a workload trace (.jsonl or binary) headless")
+    parser.add_argument("--generate", type=int, metavar="N",
+                        help="synthesize N Poisson jobs; written to --replay path if given, else run")
+    parser.add_argument("--rate", type=float, default=0.05, help="arrivals per tick for --generate")
+    parser.add_argument("--seed", type=int, help="random seed for --generate")
+    parser.add_argument("--scheduler", choices=sorted(SCHEDULERS), default="rr")
+    parser.add_argument("--allocator", choices=sorted(ALLOCATORS), default="first-fit")
+    parser.add_argument("--until", type=int, help="stop replay at this virtual tick")
+    parser.add_argument("--sweep", metavar="GRID", help="JSON {param: [values]} grid to run in parallel")
+    parser.add_argument("--workers", type=int, help="worker processes for --sweep (default: all cores)")
+    parser.add_argument("--repeats", type=int, default=1, help="seeded repetitions per --sweep point")
+    parser.add_argument("--out", help="CSV file that --sweep rows are streamed into")
+    parser.add_argument("--disk", metavar="IMAGE", help="persist the filesystem in this disk image")
+    parser.add_argument("--fs-blocks", type=int, help="filesystem size in blocks (default: MAX_BLOCKS)")
+    parser.add_argument("--cache-blocks", type=int, default=256, help="buffer cache size in blocks")
+    parser.add_argument("--cache-policy", choices=("lru", "2q"), default="lru", help="buffer cache replacement policy")
+    parser.add_argument("--group-commit", type=int, default=64, metavar="N",
+                        help="journal this many metadata operations per commit with --disk")
+    parser.add_argument("--crash-test", type=int, metavar="ROUNDS",
+                        help="crash the journaled filesystem ROUNDS times and verify recovery")
+    parser.add_argument("--vm-trace", help="replay a memory-reference trace ('pid addr' text or binary)")
+    parser.add_argument("--vm-generate", type=int, metavar="N", help="replay N synthetic memory references")
+    parser.add_argument("--vm-policy", choices=sorted(REPLACEMENT_POLICIES), default="lru")
+    parser.add_argument("--frames", type=int, default=1024, help="user page frames for --vm-*")
+    parser.add_argument("--tlb-entries", type=int, default=64, help="TLB size for --vm-*")
+    args = parser.parse_args()
+    sys.modules.setdefault("simulator", sys.modules[__name__])
+    if args.vm_trace or args.vm_generate:
+        vm_study(args)
+        return
+    if args.crash_test:
+        sys.exit(1 if crash_test(args) else 0)
+    if args.sweep:
+        sweep(args)
+        return
+    if args.trace or args.generate:
+        replay(args)
+        return
+    
+    for plugin in args.plugin:
+        load_plugin(plugin)
+    batch = args.batch or args.serve or args.script is not None or not sys.stdin.isatty()
+    if not batch:
+        boot_sequence(fast=args.fast_boot or fast_boot_enabled())
     
-    simulator = OSSimulator()
+    config = load_config()
+    if args.fs_blocks:
+        config["MAX_BLOCKS"] = args.fs_blocks
+    simulator = OSSimulator(config=config, disk_image=args.disk, cache_blocks=args.cache_blocks,
+                            cache_policy=args.cache_policy, group_commit=args.group_commit)
+    if args.disk:
+        # Mount now so a mismatched image stops here instead of at the first command
+        try:
+            simulator.fs
+        except FileSystemError as e:
+            print(f"Cannot mount {args.disk}: {e}", file=sys.stderr)
+            sys.exit(1)
+    simulator.startup_seconds = time.perf_counter() - started
+    if args.serve:
+        serve(args.serve, simulator)
+        return
+    shell = Shell(simulator, interactive=not batch)
+    if batch:
+        if args.script and args.script != "-":
+            with open(args.script) as script:
+                shell.run(iter(script))
+        else:
+            shell.run(iter(sys.stdin))
+        sys.exit(1 if shell.unknown_commands else 0)
     
     print("=" * 60)
     print("Operating System OS Shell v1.0")
     print("Type 'help' for available commands")
+    print(f"Ready in {simulator.startup_seconds * 1000:.1f} ms")
     print("=" * 60)
     print()
-    
-    while True:
-        try:
-            cmd_input = input("> ").strip()
-            
-            if not cmd_input:
-                continue
-            
-            parts = cmd_input.split(maxsplit=1)
-            cmd = parts[0].lower()
-            arg = parts[1] if len(parts) > 1 else ""
-            
-            if cmd == "help":
-                simulator.show_help()
-            
-            elif cmd == "ps":
-                simulator.list_processes()
-            
-            elif cmd == "exec":
-                if arg:
-                    simulator.create_process(arg, priority=0)
-                else:
-                    print("Usage: exec <process_name>")
-            
-            elif cmd == "ls":
-                simulator.list_directory(simulator.current_directory)
-            
-            elif cmd == "pwd":
-                print(simulator.current_directory)
-                print()
-            
-            elif cmd == "mkdir":
-                if arg:
-                    simulator.create_directory(arg)
-                    print()
-                else:
-                    print("Usage: mkdir <directory_name>")
-            
-            elif cmd == "touch":
-                if arg:
-                    simulator.create_file(arg)
-                    print()
-                else:
-                    print("Usage: touch <filename>")
-            
-            elif cmd == "echo":
-                if arg:
-                    print(arg)
-                    print()
-                else:
-                    print()
-            
-            elif cmd == "meminfo":
-                simulator.show_memory_info()
-            
-            elif cmd == "uptime":
-                simulator.show_uptime()
-            
-            elif cmd == "clear":
-                clear_screen()
-            
-            elif cmd == "exit":
-                print("Exiting shell...")
-                print("Shutting down kernel...")
-                print("System halted.")
-                break
-            
-            else:
-                print(f"Unknown command: {cmd}")
-                print("Type 'help' for available commands.")
-                print()
-        
-        except KeyboardInterrupt:
-            print("\n\nInterrupt received. Type 'exit' to shutdown.")
-            print()
-        except EOFError:
-            print("\nExiting shell...")
-            break
+    shell.run()
 
 if __name__ == "__main__":
     main()